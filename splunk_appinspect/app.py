@@ -1,13 +1,16 @@
 # Copyright 2018 Splunk Inc. All rights reserved.
 
 # Python Standard Libraries
+import concurrent.futures
 import hashlib
 import logging
+import multiprocessing
 import os
 import re
 import stat
 import subprocess
 import tarfile
+import threading
 import traceback
 import StringIO
 import platform
@@ -35,12 +38,60 @@ import saved_searches
 import transforms_configuration_file
 import web_configuration_file
 import workflow_actions
+import xml_scan
 # Third Party Libraries
+import bs4
 if not platform.system() == "Windows":
     import magic
 
 logger = logging.getLogger(__name__)
 
+# Number of threads used to issue os.lstat calls in App.stat_files
+STAT_FILES_MAX_WORKERS = 8
+
+
+def _lstat_or_none(file_path):
+    try:
+        return os.lstat(file_path)
+    except OSError:
+        return None
+
+
+# Number of threads used to describe the files of an App with libmagic. This
+# is mostly waiting on file reads, so more threads than CPUs are used
+MAGIC_MAX_WORKERS = min(32, multiprocessing.cpu_count() * 4)
+
+# A magic.Magic cookie can not be shared between threads, so each thread that
+# describes files creates its own once and reuses it
+_magic_cookies = threading.local()
+
+
+def _describe_file(file_path):
+    cookie = getattr(_magic_cookies, "cookie", None)
+    if cookie is None:
+        cookie = magic.Magic()
+        _magic_cookies.cookie = cookie
+    return cookie.from_file(file_path)
+
+
+# Number of threads used to scan xml files in App.get_xml_scans
+XML_SCAN_MAX_WORKERS = multiprocessing.cpu_count()
+
+
+def _slice_walk(app_dir_walk, root_path):
+    # A top down walk lists a directory right before everything below it,
+    # in the order that a walk of that directory would
+    sliced_walk = []
+    for base, directories, files in app_dir_walk:
+        base_path = os.path.join(base, "")
+        if base_path == root_path:
+            sliced_walk.append((root_path, directories, files))
+        elif sliced_walk:
+            if not base_path.startswith(root_path):
+                break
+            sliced_walk.append((base, directories, files))
+    return sliced_walk
+
 
 class App(object):
     """A class for providing an interface to a Splunk App. Used to create helper
@@ -85,6 +136,15 @@ class App(object):
             package = app_package_handler.AppPackage.factory(location)
         self.package = package
         self._static_slim_app_dependencies = None
+        self._saved_searches = None
+        self._file_exists_cache = {}
+        self._search_for_patterns_cache = {}
+        self._file_stat_cache = {}
+        self._walk_cache = {}
+        self._filepaths_of_files_cache = {}
+        self._xml_scan_cache = {}
+        self._web_confs = {}
+        self._rest_maps = {}
 
         self.LINUX_ARCH = "linux"
         self.WIN_ARCH = "win"
@@ -99,6 +159,11 @@ class App(object):
                                os.path.join(self.app_dir, "darwin_x86_64", "bin")],
             self.DEFAULT_ARCH: [os.path.join(self.app_dir, "bin")]
         }
+        # The bin directories of the platform-specific architectures only
+        self.non_default_arch_bin_dirs = frozenset(bin_dir
+                                                   for arch in self.arch_bin_dirs
+                                                   if arch != self.DEFAULT_ARCH
+                                                   for bin_dir in self.arch_bin_dirs[arch])
         # Store the base directories for scripts to be located. Generally
         # speaking any app-specific code will be in these base directories and
         # third-party libraries may be included within subdirectories of thesel
@@ -108,11 +173,18 @@ class App(object):
                               [os.path.join("bin", "scripts")])
         self.info_from_file = {}
         if not platform.system() == "Windows":
-            for directory, file, ext in self.iterate_files():
-                current_file_relative_path = os.path.join(directory, file)
-                current_file_full_path = self.get_filename(current_file_relative_path)
-                output = magic.from_file(current_file_full_path)
-                self.info_from_file[current_file_relative_path] = output 
+            # iterate_files yields directories with a trailing separator, so
+            # paths are built by concatenation instead of a join per file
+            app_root_path = os.path.join(self.app_dir, "")
+            relative_file_paths = [directory + file
+                                   for directory, file, ext
+                                   in self.iterate_files()]
+            file_paths = [app_root_path + relative_file_path
+                          for relative_file_path
+                          in relative_file_paths]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=MAGIC_MAX_WORKERS) as threadpool:
+                self.info_from_file.update(zip(relative_file_paths,
+                                               threadpool.map(_describe_file, file_paths)))
 
     def targlob(self):
         """
@@ -483,35 +555,48 @@ class App(object):
         :param recurse_depth This is used to indicate how deep you want
             traversal to go. 0 means do no recurse, but return the files at the
             directory specified.
+
+        Yields (directory, filename, extension) tuples. The directory is
+        relative to the app and either ends with a path separator or is empty,
+        so `directory + filename` is the relative path of the file.
         """
-        excluded_dirs = excluded_dirs or []
-        types = types or []
-        excluded_types = excluded_types or []
-        excluded_bases = excluded_bases or []
+        # Converted to sets once, as they are tested for every directory and
+        # file that is walked
+        excluded_dirs = frozenset(excluded_dirs or [])
+        types = frozenset(types or [])
+        excluded_types = frozenset(excluded_types or [])
+        excluded_bases = frozenset(excluded_bases or [])
         check_extensions = len(types) > 0
 
         if not isinstance(basedir, list):
             basedir = [basedir]
 
+        app_root_path = os.path.join(self.app_dir, "")
         for subdir in basedir:
             root_path = os.path.join(self.app_dir, subdir, "")
             root_depth = root_path.count(os.path.sep)
 
-            for base, directories, files in os.walk(root_path):
+            excluded_path = None
+            for base, directories, files in self.walk(subdir):
                 # Adds a trailing '/' or '\'. This is needed to help determine the
                 # depth otherwise the calculation is off by one
                 base = os.path.join(base, "")
+
+                # Filters undesired directories. The cached walk can not be
+                # pruned, but as it is top down everything below an excluded
+                # directory directly follows it and is skipped by its prefix.
+                if excluded_path is not None and base.startswith(excluded_path):
+                    continue
+                if (excluded_dirs and base != root_path and
+                        os.path.basename(base[:-1]) in excluded_dirs):
+                    excluded_path = base
+                    continue
+
                 current_iteration_depth = base.count(os.path.sep)
                 current_depth = current_iteration_depth - root_depth
 
-                # Filters undesired directories
-                directories[:] = [directory
-                                  for directory
-                                  in directories
-                                  if directory not in excluded_dirs]
-
                 # Create the file's relative path from within the app
-                dir_in_app = base.replace(self.app_dir + os.path.sep, '')
+                dir_in_app = base[len(app_root_path):] if base.startswith(app_root_path) else base
                 if current_depth <= recurse_depth:
                     for file in files:
                         filebase, ext = os.path.splitext(file)
@@ -524,11 +609,58 @@ class App(object):
                 else:
                     next
 
+    def walk(self, basedir=''):
+        """Returns the os.walk of a directory of the app as a list of
+        (directory path, directory names, file names) tuples.
+
+        The app is not modified while it is being validated, so each directory
+        is only walked once and the result is shared by every check that
+        iterates over the app's files. The returned lists must not be
+        modified, which also means the walk can not be pruned in place.
+
+        The walks of subdirectories, e.g. `default`, are sliced from the walk
+        of the whole app, so the file system is only walked once.
+
+        :param basedir The directory to walk, relative to the app directory
+        """
+        root_path = os.path.join(self.app_dir, basedir, "")
+        app_dir_walk = self._walk_cache.get(root_path)
+        if app_dir_walk is None:
+            app_root_path = os.path.join(self.app_dir, "")
+            if root_path == app_root_path:
+                app_dir_walk = list(os.walk(root_path))
+            else:
+                app_dir_walk = _slice_walk(self.walk(), root_path)
+                if not app_dir_walk:
+                    # Not a directory that the walk of the app descended
+                    # into, e.g. a missing or linked directory
+                    app_dir_walk = list(os.walk(root_path))
+            self._walk_cache[root_path] = app_dir_walk
+        return app_dir_walk
+
     def get_filepaths_of_files(self, basedir="", excluded_dirs=None, filenames=None, types=None):
+        """Returns a list of (relative path, full path) tuples of the files in
+        the app, filtered the same way as iterate_files. If filenames are
+        given, only the files with one of those names, without their
+        extension, are returned.
+
+        The result is cached per set of arguments, as the extracted app is not
+        modified while it is being validated and many checks ask for the same
+        files, e.g. all of the xml files.
+        """
         excluded_dirs = excluded_dirs or []
         filenames = filenames or []
         types = types or []
-
+        # basedir may be given as either a single directory or a list of them
+        cache_key = (tuple(basedir) if isinstance(basedir, list) else basedir,
+                     tuple(excluded_dirs),
+                     tuple(filenames),
+                     tuple(types))
+        cached_filepaths = self._filepaths_of_files_cache.get(cache_key)
+        if cached_filepaths is not None:
+            return list(cached_filepaths)
+
+        filepaths = []
         for directory, file, ext in self.iterate_files(basedir=basedir,
                                                        excluded_dirs=excluded_dirs,
                                                        types=types,
@@ -545,7 +677,10 @@ class App(object):
             if (check_filenames and filename_is_in_filenames):
                 next
             else:
-                yield (current_file_relative_path, current_file_full_path)
+                filepaths.append((current_file_relative_path, current_file_full_path))
+
+        self._filepaths_of_files_cache[cache_key] = filepaths
+        return list(filepaths)
 
     def file_exists(self, *path_parts):
         """Check for the existence of a file given the relative path.
@@ -554,9 +689,15 @@ class App(object):
         Example:
         if app.file_exists('default', 'transforms.conf'):
              print "File exists! Validate that~!~"
+
+        The result is cached per path, as the extracted app is not modified
+        while it is being validated and many checks ask about the same files.
         """
         file_path = os.path.join(self.app_dir, *path_parts)
-        does_file_exist = os.path.isfile(file_path)
+        does_file_exist = self._file_exists_cache.get(file_path)
+        if does_file_exist is None:
+            does_file_exist = os.path.isfile(file_path)
+            self._file_exists_cache[file_path] = does_file_exist
 
         log_output = ("'{}.{}' was called. File path being checked:'{}'."
                       " Does File Exist:{}").format(__file__,
@@ -635,17 +776,37 @@ class App(object):
                 return False
         return True
 
-    def search_for_patterns(self, patterns, basedir='', excluded_dirs=None, types=None, excluded_types=None, excluded_bases=None):
+    def search_for_patterns(self, patterns, basedir='', excluded_dirs=None, types=None, excluded_types=None, excluded_bases=None,
+                            prefilter=None):
         """ Takes a list of patterns and iterates through all files, running
         each of the patterns on each line of each of those files.
 
         Returns a list of tuples- the first element is the file (with line
         number), the second is the match from the regular expression.
+
+        :param prefilter An optional regex that has to be found on a line for
+            any of the patterns to match on it. Files and lines without a
+            prefilter match are not searched with the patterns. See
+            InspectedFile.search_for_patterns.
+
+        The result is cached per set of arguments, as the extracted app is not
+        modified while it is being validated and several checks search the
+        same files for the same patterns.
         """
         excluded_dirs = excluded_dirs or []
         types = types or []
         excluded_types = excluded_types or []
         excluded_bases = excluded_bases or []
+        # basedir may be given as either a single directory or a list of them
+        cache_key = (tuple(patterns),
+                     tuple(basedir) if isinstance(basedir, list) else basedir,
+                     tuple(excluded_dirs),
+                     tuple(types), tuple(excluded_types),
+                     tuple(excluded_bases), prefilter)
+        cached_matches = self._search_for_patterns_cache.get(cache_key)
+        if cached_matches is not None:
+            return list(cached_matches)
+
         matches = []
         all_excluded_types = ['.pyc', '.pyo']
         all_excluded_types.extend(excluded_types)  # never search these files
@@ -657,22 +818,22 @@ class App(object):
                                             excluded_bases=excluded_bases)
         for dir, filename, ext in files_iterator:
             relative_filepath = os.path.join(dir, filename)
-            file_to_inspect = inspected_file.InspectedFile.factory(os.path.join(self.app_dir,
-                                                                                dir,
-                                                                                filename))
-            found_matches = file_to_inspect.search_for_patterns(patterns)
-            matches_with_relative_path = []
-            for (fileref_output, file_match) in found_matches:
-                filepath, line_number = fileref_output.rsplit(":", 1)
-                relative_file_ref_output = "{}:{}".format(relative_filepath,
-                                                          line_number)
-                matches_with_relative_path.append((relative_file_ref_output,
-                                                   file_match))
-            matches.extend(matches_with_relative_path)
-
-        return matches
-
-    def search_for_pattern(self, pattern, basedir='', excluded_dirs=None, types=None, excluded_types=None, excluded_bases=None):
+            absolute_filepath = os.path.join(self.app_dir, dir, filename)
+            file_to_inspect = inspected_file.InspectedFile.factory(absolute_filepath)
+            found_matches = file_to_inspect.search_for_patterns(patterns, prefilter=prefilter)
+            # Every file reference of this file is "<absolute_filepath>:<line>",
+            # so the ":<line>" suffix is kept as is instead of being split off
+            # and formatted again for each match
+            absolute_filepath_length = len(absolute_filepath)
+            matches.extend((relative_filepath + fileref_output[absolute_filepath_length:], file_match)
+                           for fileref_output, file_match
+                           in found_matches)
+
+        self._search_for_patterns_cache[cache_key] = matches
+        return list(matches)
+
+    def search_for_pattern(self, pattern, basedir='', excluded_dirs=None, types=None, excluded_types=None, excluded_bases=None,
+                           prefilter=None):
         """ Takes a pattern and iterates over matching files, testing each line.
         Same as search_for_patterns, but with a single pattern.
         """
@@ -685,7 +846,8 @@ class App(object):
                                         excluded_dirs=excluded_dirs,
                                         types=types,
                                         excluded_types=excluded_types,
-                                        excluded_bases=excluded_bases)
+                                        excluded_bases=excluded_bases,
+                                        prefilter=prefilter)
 
     def search_for_crossline_patterns(self, patterns, basedir='', excluded_dirs=None, types=None, excluded_types=None, excluded_bases=None, cross_line=10):
         """ Takes a list of patterns and iterates through all files, running
@@ -709,18 +871,14 @@ class App(object):
                                             excluded_bases=excluded_bases)
         for dir, filename, ext in files_iterator:
             relative_filepath = os.path.join(dir, filename)
-            file_to_inspect = inspected_file.InspectedFile.factory(os.path.join(self.app_dir,
-                                                                                dir,
-                                                                                filename))
+            absolute_filepath = os.path.join(self.app_dir, dir, filename)
+            file_to_inspect = inspected_file.InspectedFile.factory(absolute_filepath)
             found_matches = file_to_inspect.search_for_crossline_patterns(patterns=patterns, cross_line=cross_line)
-            matches_with_relative_path = []
-            for (fileref_output, file_match) in found_matches:
-                filepath, line_number = fileref_output.rsplit(":", 1)
-                relative_file_ref_output = "{}:{}".format(relative_filepath,
-                                                          line_number)
-                matches_with_relative_path.append((relative_file_ref_output,
-                                                   file_match))
-            matches.extend(matches_with_relative_path)
+            # Same relative file reference handling as search_for_patterns
+            absolute_filepath_length = len(absolute_filepath)
+            matches.extend((relative_filepath + fileref_output[absolute_filepath_length:], file_match)
+                           for fileref_output, file_match
+                           in found_matches)
 
         return matches
 
@@ -740,22 +898,123 @@ class App(object):
                                         excluded_bases=excluded_bases,
                                         cross_line=cross_line)
 
+    def stat_files(self, filenames):
+        """Returns the os.lstat result of each of the given files, relative to
+        the app directory, in the same order. None is returned for a file that
+        can not be stat'ed. Symbolic links are not followed, callers that
+        inspect permissions should skip results that are not regular files
+        (see stat.S_ISREG).
+
+        The calls are issued from a thread pool, as os.lstat releases the GIL
+        while it waits on the file system and the extracted app may live on
+        network-backed storage. Results are cached per file, so checks that
+        inspect the permissions of the same files only stat them once.
+        """
+        uncached_filenames = [filename
+                              for filename
+                              in set(filenames)
+                              if filename not in self._file_stat_cache]
+        if uncached_filenames:
+            file_paths = [os.path.join(self.app_dir, filename)
+                          for filename
+                          in uncached_filenames]
+            with concurrent.futures.ThreadPoolExecutor(max_workers=STAT_FILES_MAX_WORKERS) as threadpool:
+                self._file_stat_cache.update(zip(uncached_filenames,
+                                                 threadpool.map(_lstat_or_none, file_paths)))
+        return [self._file_stat_cache[filename]
+                for filename
+                in filenames]
+
     def is_executable(self, filename):
         """ Checks to see if any of the executable bits are set on a file
         """
         # TODO: tests needed
-        st = os.stat(os.path.join(self.app_dir, filename))
+        st = self._file_stat_cache.get(filename)
+        # The cache holds os.lstat results, which only match os.stat for
+        # regular files
+        if st is None or not stat.S_ISREG(st.st_mode):
+            st = os.stat(os.path.join(self.app_dir, filename))
         return bool(st.st_mode & (stat.S_IXOTH | stat.S_IXUSR | stat.S_IXGRP))
 
+    def get_file_info(self, filename):
+        """Returns the libmagic description of a file, given its path relative
+        to the app directory. The descriptions of all files are collected when
+        the App is created, files added to the app since are described on
+        demand.
+        """
+        output = self.info_from_file.get(filename)
+        if output is None:
+            output = _describe_file(self.get_filename(filename))
+        return output
+
+    def get_xml_soup(self, full_filepath):
+        """Returns the BeautifulSoup of an xml file, parsed with the
+        `lxml-xml` parser.
+
+        Soups are not cached. They take many times the size of their file in
+        memory, and the checks that use them each walk all of their files in
+        turn, so a bounded cache would evict every soup before the next check
+        reached it. The inspected elements that many checks share are cached
+        as scans instead, see get_xml_scans.
+
+        :param full_filepath The absolute path of the xml file
+        """
+        with open(full_filepath, 'rb') as xml_file:
+            content = xml_file.read()
+        # Character set detection is skipped for the usual UTF-8 files
+        from_encoding = "utf-8" if xml_scan.is_utf_8(content) else None
+        return bs4.BeautifulSoup(content, "lxml-xml",
+                                 from_encoding=from_encoding)
+
+    def get_xml_scans(self, full_filepaths):
+        """Returns the elements of each of the given xml files that are
+        inspected by the Simple XML checks, as collected by
+        xml_scan.scan_xml, in the same order.
+
+        Each file is streamed once and the result is cached and shared between
+        the checks, as long as the file's modification time and size are
+        unchanged. Files that have not been scanned yet are scanned from a
+        thread pool, which overlaps reading the files with parsing them.
+
+        :param full_filepaths The absolute paths of the xml files
+        """
+        file_versions = {}
+        for full_filepath in set(full_filepaths):
+            st = os.stat(full_filepath)
+            file_versions[full_filepath] = (st.st_mtime, st.st_size)
+        unscanned_filepaths = [full_filepath
+                               for full_filepath, file_version
+                               in file_versions.iteritems()
+                               if self._xml_scan_cache.get(full_filepath, (None, None))[0] != file_version]
+        if len(unscanned_filepaths) == 1:
+            # Not worth starting threads for, e.g. from get_xml_scan
+            full_filepath = unscanned_filepaths[0]
+            self._xml_scan_cache[full_filepath] = (file_versions[full_filepath],
+                                                   xml_scan.scan_xml(full_filepath))
+        elif unscanned_filepaths:
+            max_workers = min(XML_SCAN_MAX_WORKERS, len(unscanned_filepaths))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as threadpool:
+                for full_filepath, scan in zip(unscanned_filepaths,
+                                               threadpool.map(xml_scan.scan_xml, unscanned_filepaths)):
+                    self._xml_scan_cache[full_filepath] = (file_versions[full_filepath], scan)
+        return [self._xml_scan_cache[full_filepath][1]
+                for full_filepath
+                in full_filepaths]
+
+    def get_xml_scan(self, full_filepath):
+        """Returns the elements of an xml file that are inspected by the
+        Simple XML checks. See get_xml_scans.
+
+        :param full_filepath The absolute path of the xml file
+        """
+        return self.get_xml_scans([full_filepath])[0]
+
     def is_text(self, filename):
         """Checks to see if the file is a text type via the 'file' command.
         Notice: This method should only be used in Unix environment
         """
-        if filename in self.info_from_file:
-            return True if re.search(r'.* text', self.info_from_file[filename], re.IGNORECASE) else False
         try:
-            file_path = self.get_filename(filename)
-            output = magic.from_file(file_path)
+            output = self.get_file_info(filename)
             return True if re.search(r'.* text', output, re.IGNORECASE) else False
         except Exception as e:
             # TODO: Self log error here.  Issues with hidden folders
@@ -777,10 +1036,18 @@ class App(object):
         return modular_inputs.ModularInputs.factory(self)
 
     def get_rest_map(self, dir='default'):
-        return rest_map.RestMap(self, dir)
+        # Shared by the restmap.conf and web.conf checks so that each
+        # restmap.conf is parsed once per app
+        if dir not in self._rest_maps:
+            self._rest_maps[dir] = rest_map.RestMap(self, dir)
+        return self._rest_maps[dir]
 
     def get_saved_searches(self):
-        return saved_searches.SavedSearches(self)
+        # Shared by all of the saved search checks so that savedsearches.conf
+        # is parsed once per app instead of once per check
+        if self._saved_searches is None:
+            self._saved_searches = saved_searches.SavedSearches(self)
+        return self._saved_searches
 
     def get_workflow_actions(self):
         return workflow_actions.WorkFlowActions(self)
@@ -834,9 +1101,14 @@ class App(object):
                                config_file=transforms_configuration_file.TransformsConfigurationFile())
 
     def web_conf(self, dir='default'):
-        return self.get_config('web.conf',
-                               dir=dir,
-                               config_file=web_configuration_file.WebConfigurationFile())
+        # Shared by all of the web.conf checks so that web.conf is parsed once
+        # per app and directory instead of once per check. A missing file
+        # raises IOError every time, it is not cached
+        if dir not in self._web_confs:
+            self._web_confs[dir] = self.get_config('web.conf',
+                                                   dir=dir,
+                                                   config_file=web_configuration_file.WebConfigurationFile())
+        return self._web_confs[dir]
 
     def server_conf(self, dir='default'):
         return self.get_config('server.conf',
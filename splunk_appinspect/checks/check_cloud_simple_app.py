@@ -14,9 +14,6 @@ import re
 import subprocess
 import codecs
 # Third-Party Libraries
-import bs4
-if not platform.system() == "Windows":
-    import magic
 from lxml import etree
 # Custom Libraries
 import splunk_appinspect
@@ -24,9 +21,14 @@ from splunk_appinspect.documentation import DocumentationLinks
 from splunk_appinspect.lookup import LookupHelper
 from splunk_appinspect.app_util import find_readmes
 from splunk_appinspect.configuration_parser import InvalidSectionError
+from splunk_appinspect import xml_scan
 
 logger = logging.getLogger(__name__)
 
+# libmagic descriptions of text files, e.g. `ASCII text` or
+# `UTF-8 Unicode text`
+TEXT_FILE_OUTPUT_REGEX = re.compile("ASCII text|Unicode.*text", re.DOTALL | re.IGNORECASE)
+
 # ------------------------------------------------------------------------------
 # White List Checks Go Here
 # ------------------------------------------------------------------------------
@@ -155,7 +157,7 @@ def check_default_data_ui_manager_for_plain_text_credentials(app, reporter):
             file_path = os.path.join(directory, filename)
             if ext == '.xml':
                 full_filepath = app.get_filename(directory, filename)
-                soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
+                soup = app.get_xml_soup(full_filepath)
                 # element has 3 attributes: name, type, label
                 # text should be the text string in element
                 type_list = soup.find_all("element", {"type": re.compile("^password$")})
@@ -292,15 +294,9 @@ def check_static_directory_file_white_list(app, reporter):
                 else:
                     # Inspect the file types by `file` command
                     current_file_relative_path = os.path.join(directory, filename)
-                    current_file_full_path = app.get_filename(current_file_relative_path)
-                    if current_file_relative_path in app.info_from_file:
-                        file_output = app.info_from_file[current_file_relative_path]
-                    else:
-                        file_output = magic.from_file(current_file_full_path)
-                    file_output_regex = re.compile("(.)*ASCII text(.)*|(.)*Unicode(.)*text(.)*",
-                                                   re.DOTALL | re.IGNORECASE | re.MULTILINE)
+                    file_output = app.get_file_info(current_file_relative_path)
                     # If it is not a text file, then manually check it
-                    if not re.match(file_output_regex, file_output):
+                    if not TEXT_FILE_OUTPUT_REGEX.search(file_output):
                         reporter_output = ("This file does not appear to be a text file. Please provide a text file."
                                            "File: {}"
                                            ).format(file_path)
@@ -1047,7 +1043,7 @@ def check_setup_xml_for_incorrect_password_rest_endpoint(app, reporter):
         file_path = os.path.join("default", "setup.xml")
         full_filepath = app.get_filename("default", "setup.xml")
         try:
-            root = etree.parse(full_filepath)
+            root = etree.parse(full_filepath, xml_scan.xml_parser())
             password_elements = root.xpath("/setup/block/input[type='password']/type")
             endpoint_key = "endpoint"
             endpoint_value = "storage/passwords"
@@ -1797,15 +1793,11 @@ def check_for_binary_files_without_source_code(app, reporter):
 
         for directory, file, extension in app_files_iterator:
             current_file_relative_path = os.path.join(directory, file)
-            current_file_full_path = app.get_filename(current_file_relative_path)
 
             try:
                 # file_output = subprocess.check_output(["file", "-b", current_file_full_path])
                 # using magic library to substitute the original file cmd
-                if current_file_relative_path in app.info_from_file:
-                    file_output = app.info_from_file[current_file_relative_path]
-                else:
-                    file_output = magic.from_file(current_file_full_path)
+                file_output = app.get_file_info(current_file_relative_path)
             except Exception, e:
                 # in case of any further exception, throw a manual check instead of an internal error
                 reporter.manual_check("Please manually check {} ({} {} {})\r\n"
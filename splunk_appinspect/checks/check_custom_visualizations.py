@@ -25,6 +25,11 @@ from splunk_appinspect.configuration_file import NoOptionError
 
 logger = logging.getLogger(__name__)
 
+# Only the <style> tags of formatter.html are built into a tree by the checks
+# that inspect them, the rest of the document is skipped while parsing
+STYLE_TAG_STRAINER = bs4.SoupStrainer("style")
+
+
 @splunk_appinspect.tags("splunk_appinspect", "custom_visualizations")
 @splunk_appinspect.cert_version(min="1.5.0")
 def check_for_visualizations_preview_png(app, reporter):
@@ -471,7 +476,7 @@ def check_for_formatter_html_css_expressions(app, reporter):
                 with open(formatter_html_full_path) as f:
                     content = f.read()
                     content = "<div>" + content + "</div>"
-                soup = bs4.BeautifulSoup(content, "lxml-xml")
+                soup = bs4.BeautifulSoup(content, "lxml-xml", parse_only=STYLE_TAG_STRAINER)
 
                 for style_tag in soup.find_all("style"):
                     new_text = re.sub("(^|[\s\W])expression(\s*\()",
@@ -527,7 +532,7 @@ def check_for_formatter_html_inline_style_attributes(app, reporter):
                 with open(formatter_html_full_path) as f:
                     content = f.read()
                     content = "<div>" + content + "</div>"
-                soup = bs4.BeautifulSoup(content, "lxml-xml")
+                soup = bs4.BeautifulSoup(content, "lxml-xml", parse_only=STYLE_TAG_STRAINER)
 
                 for style_tag in soup.find_all("style"):
                     if "style" not in style_tag.attrs:
@@ -23,6 +23,7 @@ from splunk_appinspect.regex_matcher import JSUDPCommunicationMatcher
 from splunk_appinspect.regex_matcher import ConfEndpointMatcher
 
 from splunk_appinspect.reflected_xss_detector import ReflectedXSSDetector
+from splunk_appinspect import xml_scan
 
 logger = logging.getLogger(__name__)
 
@@ -165,7 +166,7 @@ def check_for_stored_xss_in_javascript(app, reporter):
     '''
     if app.file_exists("default", "setup.xml"):
         setup_full_filepath = app.get_filename("default", "setup.xml")
-        root = etree.parse(setup_full_filepath)
+        root = etree.parse(setup_full_filepath, xml_scan.xml_parser())
         conf_endpoints = [b.attrib['endpoint'].split('/')[-1] for b in root.iter("block") if 'endpoint' in b.attrib]
         if conf_endpoints:
             matcher = ConfEndpointMatcher()
@@ -30,7 +30,7 @@ def check_validate_no_duplicate_stanzas_in_meta_files(app, reporter):
     stanzas_found = collections.defaultdict(list)
 
     for fileref_output, match in stanzas:
-        filepath, line_number = fileref_output.rsplit(":", 1)
+        filepath, _, line_number = fileref_output.rpartition(":")
         file_stanza = (filepath, match.group())
         stanzas_found[file_stanza].append(line_number)
 
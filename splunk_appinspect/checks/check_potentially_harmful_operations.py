@@ -48,7 +48,7 @@ def check_hard_coded_paths(app, reporter):
                                      excluded_dirs=excluded_directories,
                                      excluded_types=excluded_types)
     for result, match in results:
-        file_name, line_number = result.rsplit(":", 1)
+        file_name, _, line_number = result.rpartition(":")
         if platform.system() == "Windows":
             reporter_output = ("{} will be checked for hard-coded paths during code review. "
                                "File: {}, Line: {}."
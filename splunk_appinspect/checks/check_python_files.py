@@ -67,7 +67,7 @@ def check_for_possible_threading(app, reporter):
 
     if python_files:
         for (fileref_output, match) in matches:
-            filename, line_number = fileref_output.rsplit(":", 1)
+            filename, _, line_number = fileref_output.rpartition(":")
             reporter_output = ("The following line will be inspected during code review."
                                " Match: {}"
                                " File: {}"
@@ -101,7 +101,7 @@ def check_built_in_import_function(app, reporter):
                                       types=[".py"])
     if len(all_python_files) > 0:
         for (fileref_output, match) in matches:
-            filepath, line_number = fileref_output.rsplit(":", 1)
+            filepath, _, line_number = fileref_output.rpartition(":")
             reporter_output = ("The `__import__` function was detected being"
                                " used. Please use the `import` keyword instead."
                                " Third-Party libraries are exempt from this"
@@ -41,8 +41,9 @@ def check_saved_searches_are_not_disabled(app, reporter):
     if saved_searches.configuration_file_exists():
         file_path = os.path.join("default", "savedsearches.conf")
         for search in saved_searches.searches():
-            if search.disabled == "1":
-                lineno = search.args["disabled"][1]
+            disabled = search.args.get("disabled")
+            if disabled and disabled[0] == "1":
+                lineno = disabled[1]
                 message = ("The search [{}] in savedsearches.conf is"
                            " disabled. File: {}, Line: {}."
                            ).format(search.name,
@@ -169,29 +170,27 @@ def check_for_gratuitous_cron_scheduling(app, reporter):
     if app.file_exists("default", "savedsearches.conf"):
         file_path = os.path.join("default", "savedsearches.conf")
         saved_searches = app.get_saved_searches()
-        cron_schedule_saved_search = [saved_search
-                                      for saved_search
-                                      in saved_searches.searches()
-                                      if saved_search.cron_schedule]
-
+        has_cron_schedule_saved_search = False
         invalid_cron_schedule_saved_searches = []
         gratuitous_cron_schedule_saved_searches = []
-        for saved_search in cron_schedule_saved_search:
+        for saved_search in saved_searches.searches():
+            if not saved_search.cron_schedule:
+                continue
+            has_cron_schedule_saved_search = True
             try:
                 exp = CronExpression(saved_search.cron_schedule)
                 if not exp.is_valid():
                     invalid_cron_schedule_saved_searches.append(saved_search)
                 elif exp.is_high_occurring():
-                    minutes_field = exp.fields[0]
-                    occurrences = CronExpression._get_occurrences_in_an_hour(minutes_field)
+                    occurrences = exp.get_occurrences_in_an_hour()
                     gratuitous_cron_schedule_saved_searches.append((saved_search,occurrences))
             except:
                 invalid_cron_schedule_saved_searches.append(saved_search)
 
-        if cron_schedule_saved_search:
+        if has_cron_schedule_saved_search:
             if gratuitous_cron_schedule_saved_searches:
                 for saved_search,occurrences in gratuitous_cron_schedule_saved_searches:
-                    lineno = saved_search.args["cron_schedule"][1]
+                    cron_schedule, lineno = saved_search.args["cron_schedule"]
                     reporter_output = ("The saved search [{}] was detected with"
                                        " a high-occuring cron_schedule, i.e. During a period of an hour,"
                                        " if the search is scheduled for over 12 times, it will be"
@@ -200,19 +199,19 @@ def check_for_gratuitous_cron_scheduling(app, reporter):
                                        " is appropriate. File: {}, Line: {}."
                                        ).format(saved_search.name,
                                                 occurrences.count(True),
-                                                saved_search.cron_schedule,
+                                                cron_schedule,
                                                 file_path,
                                                 lineno)
                     reporter.warn(reporter_output, file_path, lineno)
             if invalid_cron_schedule_saved_searches:
                 for saved_search in invalid_cron_schedule_saved_searches:
-                    lineno = saved_search.args["cron_schedule"][1]
+                    cron_schedule, lineno = saved_search.args["cron_schedule"]
                     reporter_output = ("The saved search [{}] was detected with"
                                        " an invalid cron_schedule. Please"
                                        " evaluate whether `cron_schedule = {}`"
                                        " is valid. File: {}, Line: {}."
                                        ).format(saved_search.name,
-                                                saved_search.cron_schedule,
+                                                cron_schedule,
                                                 file_path,
                                                 lineno)
                     reporter.fail(reporter_output, file_path, lineno)
@@ -20,6 +20,11 @@ import splunk_appinspect
 report_display_order = 2
 logger = logging.getLogger(__name__)
 
+# Setting names allowed in the [shclustering] and [diag] stanzas, matched
+# case-insensitively against each setting name
+SHCLUSTERING_ALLOWED_SETTINGS_REGEX = re.compile(r"conf_replication_include\..*", re.IGNORECASE)
+DIAG_ALLOWED_SETTINGS_REGEX = re.compile(r"EXCLUDE-.*", re.IGNORECASE)
+
 
 @splunk_appinspect.tags("cloud")
 @splunk_appinspect.cert_version(min="1.6.1")
@@ -38,9 +43,9 @@ def check_server_conf_only_contains_custom_conf_sync_stanzas_or_diag_stanza(app,
 
             for section in server_config.sections():
                 if section.name == 'shclustering':
-                    _check_disallow_settings(reporter, file_path, section, 'conf_replication_include\..*')
+                    _check_disallow_settings(reporter, file_path, section, SHCLUSTERING_ALLOWED_SETTINGS_REGEX)
                 elif section.name == 'diag':
-                    _check_disallow_settings(reporter, file_path, section, 'EXCLUDE-.*')
+                    _check_disallow_settings(reporter, file_path, section, DIAG_ALLOWED_SETTINGS_REGEX)
                 else:
                     reporter_output = "Stanza `[{}]` configures Splunk server settings " \
                                       "and is not permitted in Splunk Cloud. File: {}, Line: {}.".format(section.name,
@@ -53,21 +58,12 @@ def check_server_conf_only_contains_custom_conf_sync_stanzas_or_diag_stanza(app,
         reporter.not_applicable(reporter_output)
 
 
-def _check_disallow_settings(reporter, file_path, section, allowed_settings_pattern):
-    all_setting_names = [s.name for s in section.settings()]
-    allowed_setting_names = _get_setting_names_with_key_pattern(section, allowed_settings_pattern)
-    disallowed_settings = _get_disallowed_settings(all_setting_names, allowed_setting_names)
+def _check_disallow_settings(reporter, file_path, section, allowed_settings_regex):
+    disallowed_settings = {s.name for s in section.settings()
+                           if not allowed_settings_regex.search(s.name)}
     if disallowed_settings:
         reporter_output = "Only {} properties are allowed " \
                           "for `[{}]` stanza. The properties {} are not allowed in this stanza. " \
-                          "File: {}, Line: {}".format(allowed_settings_pattern, section.name,
+                          "File: {}, Line: {}".format(allowed_settings_regex.pattern, section.name,
                                                       disallowed_settings, file_path, section.lineno)
         reporter.fail(reporter_output, file_path, section.lineno)
-
-
-def _get_setting_names_with_key_pattern(section, pattern):
-    return [s.name for s in section.settings_with_key_pattern(pattern)]
-
-
-def _get_disallowed_settings(setting_names, allowed_settings):
-    return set(setting_names).difference(set(allowed_settings))
@@ -11,24 +11,58 @@ import logging
 import mimetypes
 import os
 import re
-import subprocess
 import stat
 import sys
 import platform
-from UserString import MutableString
+
+# The platform does not change while checks run, so it is determined once
+IS_WINDOWS = platform.system() == "Windows"
 
 # Third-Party Modules
-if not platform.system() == "Windows":
-    import magic
-else:
+if IS_WINDOWS:
+    import pywintypes
     import win32security
     import ntsecuritycon as con
+    # Looked up once at import rather than for every file without a DACL
+    EVERYONE_SID, _, _ = win32security.LookupAccountName("", "Everyone")
 # Custom Modules
 import splunk_appinspect
 
 logger = logging.getLogger(__name__)
 report_display_order = 5
 
+# Execute permission for owners, groups or others
+EXECUTE_PERMISSION_BITS = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+# AceType of an access allowed ACE
+ACCESS_ALLOWED_ACE = 0
+# Windows accounts that are allowed to hold execute and write permissions
+EXCLUDED_USERS = frozenset(['Administrators', 'SYSTEM', 'Authenticated Users'])
+# Account names by string SID. The files of an app are usually only granted to
+# a handful of accounts, so each SID is looked up once instead of once per ACE.
+_account_names_by_sid = {}
+
+FLASH_FILE_TYPES = frozenset([".f4v", ".fla", ".flv", ".jsfl", ".swc", ".swf", ".swt",
+                              ".swz", ".xfl"])
+
+# It's a little verbose but with the explicit-ness comes
+# References
+# http://tools.ietf.org/html/rfc3986
+# http://stackoverflow.com/questions/4669692/valid-characters-for-directory-part-of-a-url-for-short-links
+# Only the whole match is reported, so the groups are non-capturing. The
+# hostname is not repeated as a group, as its second character class already
+# consumes everything a repetition could match. The protocol can not start
+# inside a word, which would be matched from the word's start anyway; this
+# keeps the engine from rescanning every word of a line for a `://`.
+URL_REGEX = re.compile(r"(?<!\w)(?:\w*://)+"  # Captures protocol
+                       r"[\w\-]+\.[\w\-.]+"    # Captures hostname
+                       r"(?::\d*)?"           # Captures port
+                       r"(?:/[^\s?]*)?"       # Captures path
+                       r"(?:\?\S*)?",         # Capture query string
+                       re.IGNORECASE)
+# Every URL match contains the protocol separator, files without it are not
+# searched line by line
+URL_PREFILTER_REGEX = re.compile("://")
+
 
 @splunk_appinspect.tags("splunk_appinspect", "appapproval", "cloud")
 @splunk_appinspect.cert_version(min="1.0.0")
@@ -41,18 +75,17 @@ def check_for_bin_files(app, reporter):
     invoked directly (e.g. `./my_script.sh` or `./my_script`).
     """
     directories_to_exclude_from_root = ["bin"]
-    if platform.system() == "Windows":
-        EXCLUDED_USERS_LIST = ['Administrators', 'SYSTEM', 'Authenticated Users']
-        ACCESS_ALLOWED_ACE = 0
+    if IS_WINDOWS:
+        file_generic_execute = con.FILE_GENERIC_EXECUTE
         for dir, filename, ext in app.iterate_files(excluded_dirs=directories_to_exclude_from_root):
             if dir == "appserver\\controllers\\":
                 continue
-            current_file_relative_path = os.path.join(dir, filename)
-            current_file_full_path = app.get_filename(current_file_relative_path)
+            current_file_relative_path = dir + filename
             if ext == ".exe":
                 reporter_output = ("An executable file was detected. File: {}").format(current_file_relative_path)
                 reporter.fail(reporter_output, current_file_relative_path)
             else:
+                current_file_full_path = app.get_filename(current_file_relative_path)
                 sd = win32security.GetFileSecurity(current_file_full_path, win32security.DACL_SECURITY_INFORMATION)
                 dacl = sd.GetSecurityDescriptorDacl()
                 if dacl is None:
@@ -60,24 +93,30 @@ def check_for_bin_files(app, reporter):
                 ace_count = dacl.GetAceCount()
                 for i in range(ace_count):
                     rev, access, usersid = dacl.GetAce(i)
-                    user, group, type = win32security.LookupAccountSid('', usersid)
+                    user = _lookup_account_name(usersid)
                     ace_type = rev[0]
-                    if ace_type == ACCESS_ALLOWED_ACE and user not in EXCLUDED_USERS_LIST \
-                            and _has_permission(access, con.FILE_GENERIC_EXECUTE):
+                    if ace_type == ACCESS_ALLOWED_ACE and user not in EXCLUDED_USERS \
+                            and _has_permission(access, file_generic_execute):
                             reporter.warn(
                                 "This file has execute permissions for users otherwise Administrators, SYSTEM and Authenticated Users",
                                 current_file_relative_path)
     else:
-        for dir, filename, ext in app.iterate_files(excluded_dirs=directories_to_exclude_from_root):
-            # filter appserver/controllers/ out
-            if dir == "appserver/controllers/":
-                continue
-            current_file_relative_path = os.path.join(dir, filename)
-            current_file_full_path = app.get_filename(current_file_relative_path)
-            file_statistics = os.stat(current_file_full_path)
+        files_to_check = [(dir + filename, ext)
+                          for dir, filename, ext
+                          in app.iterate_files(excluded_dirs=directories_to_exclude_from_root)
+                          # filter appserver/controllers/ out
+                          if dir != "appserver/controllers/"]
+        files_statistics = app.stat_files([current_file_relative_path
+                                           for current_file_relative_path, ext
+                                           in files_to_check])
+        for (current_file_relative_path, ext), file_statistics in zip(files_to_check, files_statistics):
+            # Only the permissions of regular files are considered, symbolic
+            # links, sockets and FIFOs are still reported by their extension
+            is_regular_file = (file_statistics is not None and
+                               stat.S_ISREG(file_statistics.st_mode))
             # Checks the file's permissions against execute flags to see if the file
             # is executable
-            if bool(file_statistics.st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)):
+            if is_regular_file and file_statistics.st_mode & EXECUTE_PERMISSION_BITS:
                 reporter.fail(
                     "This file has execute permissions for owners, groups, or others. File: {}"
                         .format(current_file_relative_path), current_file_relative_path)
@@ -94,7 +133,7 @@ def check_for_executable_flag(app, reporter):
     a ``magic number'' stored in a particular place near the beginning of the
     file that tells the UNIX operating system that the file is a binary
     executable."""
-    if platform.system() == "Windows":
+    if IS_WINDOWS:
         # TODO: tests needed
         reporter_output = "Windows file permissions will be inspected during review."
         reporter.manual_check(reporter_output)
@@ -104,15 +143,10 @@ def check_for_executable_flag(app, reporter):
             # filter appserver/controllers/ out
             if directory == "appserver/controllers/":
                 continue
-            current_file_relative_path = os.path.join(directory, file)
-            current_file_full_path = app.get_filename(current_file_relative_path)
-            if current_file_relative_path in app.info_from_file:
-                file_output = app.info_from_file[current_file_relative_path]
-            else:
-                file_output = magic.from_file(current_file_full_path)
-            file_output_regex = re.compile("(.)*executable(.)*",
-                                           re.DOTALL | re.IGNORECASE | re.MULTILINE)
-            if re.match(file_output_regex, file_output):
+            current_file_relative_path = directory + file
+            file_output = app.get_file_info(current_file_relative_path)
+            # libmagic describes executables as e.g. `ELF 64-bit LSB executable`
+            if "executable" in file_output.lower():
                 reporter_output = ("The executable will be inspected during code review: "
                                    " File: {}").format(current_file_relative_path)
                 reporter.manual_check(reporter_output, current_file_relative_path)
@@ -124,25 +158,14 @@ def check_for_urls_in_files(app, reporter):
     """Check that URLs do not include redirect or requests from external web
     sites.
     """
-    # It's a little verbose but with the explicit-ness comes
-    # References
-    # http://tools.ietf.org/html/rfc3986
-    # http://stackoverflow.com/questions/4669692/valid-characters-for-directory-part-of-a-url-for-short-links
-    url_regex_pattern = ("(\w*://)+"                  # Captures protocol
-                         "([\w\d\-]+\.[\w\d\-\.]+)+"  # Captures hostname
-                         "(:\d*)?"                    # Captures port
-                         "(\/[^\s\?]*)?"              # Captures path
-                         "(\?[^\s]*)?")               # Capture query string
-    url_regex_object = re.compile(url_regex_pattern,
-                                  re.IGNORECASE)
-
     excluded_types = [".csv", ".gif", ".jpeg", ".jpg", ".md", ".org", ".pdf",
                       ".png", ".svg", ".txt"]
     excluded_directories = ["samples"]
 
-    url_matches = app.search_for_pattern(url_regex_pattern,
+    url_matches = app.search_for_pattern(URL_REGEX,
                                          excluded_dirs=excluded_directories,
-                                         excluded_types=excluded_types)
+                                         excluded_types=excluded_types,
+                                         prefilter=URL_PREFILTER_REGEX)
 
     if url_matches:
         # {url_pattern: {filename: [lineno_list]}}
@@ -150,7 +173,7 @@ def check_for_urls_in_files(app, reporter):
 
         for (fileref_output, match) in url_matches:
             url_match = match.group()
-            filename, line_number = fileref_output.rsplit(":", 1)
+            filename, _, line_number = fileref_output.rpartition(":")
 
             if url_match not in result_dict:
                 result_dict[url_match] = {}
@@ -169,29 +192,25 @@ def check_for_urls_in_files(app, reporter):
 
         # create some extra manual checks in order to see results in a more convenient way
         for (url_match, file_dict) in result_dict.items():
-            reporter_output = MutableString()
-            reporter_output.append("A url {} was detected in the following files".format(url_match))
-            for (file_name, lineno_list) in file_dict.items():
-                reporter_output.append(", (File: {}, Linenolist: [{}])".format(file_name, ', '.join(lineno_list)))
+            reporter_output = ["A url {} was detected in the following files".format(url_match)]
+            reporter_output.extend(", (File: {}, Linenolist: [{}])".format(file_name, ', '.join(lineno_list))
+                                   for (file_name, lineno_list) in file_dict.items())
             # don't need filename and line_number here, since it is an aggregated result
-            reporter.manual_check(str(reporter_output))
+            reporter.manual_check("".join(reporter_output))
 
 
 @splunk_appinspect.tags('splunk_appinspect', 'cloud')
 @splunk_appinspect.cert_version(min='1.0.0')
 def check_requires_adobe_flash(app, reporter):
     """Check that the app does not use Adobe Flash files."""
-    flash_file_types = [".f4v", ".fla", ".flv", ".jsfl", ".swc", ".swf", ".swt",
-                        ".swz", ".xfl"]
-    flash_files = [os.path.join(f[0], f[1])
-                   for f
-                   in app.iterate_files(types=flash_file_types)]
-    if len(flash_files) > 0:
-        for flash_file in flash_files:
-            reporter_output = ("Flash file was detected. File: {}"
-                               ).format(flash_file)
-            reporter.fail(reporter_output, flash_file)
-    else:
+    has_flash_files = False
+    for directory, filename, ext in app.iterate_files(types=FLASH_FILE_TYPES):
+        has_flash_files = True
+        flash_file = directory + filename
+        reporter_output = ("Flash file was detected. File: {}"
+                           ).format(flash_file)
+        reporter.fail(reporter_output, flash_file)
+    if not has_flash_files:
         reporter_output = "Didn't find any flash files."
         reporter.not_applicable(reporter_output)
 
@@ -208,18 +227,24 @@ def check_for_expansive_permissions(app, reporter):
     Since appinspect 1.6.1, check that no files have nt write permissions for all users.
     """
     offending_files = []
-    EXCLUDED_USERS_LIST = ['Administrators', 'SYSTEM', 'Authenticated Users']
-    ACCESS_ALLOWED_ACE = 0
-    for dir, file, ext in app.iterate_files():
-        try:
-            if os.name != "nt":
-                st = os.stat(app.get_filename(dir, file))
-                if bool(st.st_mode & stat.S_IWOTH):
-                    offending_files.append(os.path.join(dir, file))
-            else:
+    if os.name != "nt":
+        relative_file_paths = [dir + file
+                               for dir, file, ext
+                               in app.iterate_files()]
+        for relative_file_path, st in zip(relative_file_paths,
+                                          app.stat_files(relative_file_paths)):
+            # Symbolic links always have all permissions set, only the
+            # permissions of regular files are considered
+            if st is not None and stat.S_ISREG(st.st_mode) and st.st_mode & stat.S_IWOTH:
+                offending_files.append(relative_file_path)
+    else:
+        file_generic_write = con.FILE_GENERIC_WRITE
+        app_root_dir = os.path.join(app.app_dir, "")
+        for dir, file, ext in app.iterate_files():
+            try:
                 # full path in GetFileSecurity should be 
                 # the absolute path in Windows
-                full_path = os.path.join(app.app_dir, dir, file)
+                full_path = app_root_dir + dir + file
                 sd = win32security.GetFileSecurity(full_path, win32security.DACL_SECURITY_INFORMATION)
                 dacl = sd.GetSecurityDescriptorDacl()
                 if dacl is None:
@@ -231,15 +256,16 @@ def check_for_expansive_permissions(app, reporter):
                     # access: ACCESS_MASK
                     # usersid: SID
                     rev, access, usersid = dacl.GetAce(i)
-                    user, group, type = win32security.LookupAccountSid('', usersid)
+                    user = _lookup_account_name(usersid)
                     ace_type = rev[0]
                     # only need to consider AceType = ACCESS_ALLOWED_ACE
                     # not check users named "SYSTEM", "Administrators" and "Authenticated Users"
-                    if ace_type == ACCESS_ALLOWED_ACE and user not in EXCLUDED_USERS_LIST \
-                            and _has_permission(access, con.FILE_GENERIC_WRITE):
+                    if ace_type == ACCESS_ALLOWED_ACE and user not in EXCLUDED_USERS \
+                            and _has_permission(access, file_generic_write):
                         offending_files.append(full_path)
-        except:
-            pass
+            except pywintypes.error:
+                # The security information of the file could not be read
+                pass
 
     for offending_file in offending_files:
         reporter_output = ("A {} world-writable file was found."
@@ -251,14 +277,22 @@ def check_for_expansive_permissions(app, reporter):
             reporter.fail(reporter_output)
 
 
+def _lookup_account_name(sid):
+    string_sid = win32security.ConvertSidToStringSid(sid)
+    account_name = _account_names_by_sid.get(string_sid)
+    if account_name is None:
+        account_name, _, _ = win32security.LookupAccountSid('', sid)
+        _account_names_by_sid[string_sid] = account_name
+    return account_name
+
+
 def _has_permission(access, permission):
     return access & permission == permission
 
 
 def _new_dacl_with_all_control():
     dacl = win32security.ACL()
-    everyone, _, _ = win32security.LookupAccountName("", "Everyone")
-    dacl.AddAccessAllowedAce(win32security.ACL_REVISION, con.FILE_ALL_ACCESS, everyone)
+    dacl.AddAccessAllowedAce(win32security.ACL_REVISION, con.FILE_ALL_ACCESS, EVERYONE_SID)
     return dacl
 
 
@@ -266,13 +300,19 @@ def _new_dacl_with_all_control():
 @splunk_appinspect.cert_version(min="1.0.0")
 def check_for_hidden_files(app, reporter):
     """Check that there are no hidden files or directories."""
-    for base, dirs, files in os.walk(app.app_dir):
+    # The trailing separator lets each walked directory's path within the
+    # app be sliced off its absolute path
+    app_root_dir = os.path.join(app.app_dir, "")
+    for base, dirs, files in app.walk():
+        relative_base = base[len(app_root_dir):]
+        relative_base_path = os.path.join(relative_base, "")
+        # Hidden directories are reported themselves, so e.g. the contents of
+        # a `.git` directory are not
+        if any(directory.startswith(".") for directory in relative_base.split(os.path.sep)):
+            continue
         for elem in dirs + files:
             if elem.startswith("."):
-                if platform.system() == "Windows":
-                    path = os.path.join(base, elem).replace(app.app_dir + '\\', "")
-                else:
-                    path = os.path.join(base, elem).replace(app.app_dir + "/", "")
+                path = relative_base_path + elem
                 reporter_output = ("The following hidden files were found. File: {}"
                                    ).format(path)
                 reporter.fail(reporter_output, path)
@@ -284,11 +324,7 @@ def check_platform_specific_binaries(app, reporter):
     """Check that documentation declares platform-specific binaries."""
     # Can't read the documentation, but we can check for native binaries
     # TODO: we should not be generating manual checks if directories are empty
-    bin_directories = [bin_directory
-                       for arch in app.arch_bin_dirs
-                       if arch != app.DEFAULT_ARCH
-                       for bin_directory in app.arch_bin_dirs[arch]]
-    if app.some_directories_exist(bin_directories):
+    if app.some_directories_exist(app.non_default_arch_bin_dirs):
         reporter_output = ("Documentation will be read during code review.")
         reporter.manual_check(reporter_output)
     else:
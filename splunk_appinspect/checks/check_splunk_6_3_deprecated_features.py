@@ -8,15 +8,16 @@ These following features should not be supported in Splunk 6.3 or later. For mor
 
 # Python Standard Libraries
 import logging
-import re
 import os
-# Third-Party Libraries
-import bs4
 # Custom Libraries
 import splunk_appinspect
+from splunk_appinspect import xml_scan
 
 logger = logging.getLogger(__name__)
 
+# Advanced xml views of the files in this directory are not reported
+ADVANCED_XML_IGNORED_DIRECTORY = os.path.join("default", "data", "ui", "manager", "")
+
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_3", "deprecated_feature")
 @splunk_appinspect.cert_version(min="1.1.11")
@@ -29,16 +30,18 @@ def check_for_simple_xml_seed_element(app, reporter):
     Use the `<initialValue>` element instead.
     """
 
-    xml_files = list(app.get_filepaths_of_files(types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(types=[".xml"])
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        seed_elements = soup.find_all("seed")
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        seed_elements = scan[xml_scan.SEED_ELEMENTS]
         if seed_elements:
             reporter_output = ("<seed> element detected in:"
                                " file: {}").format(relative_filepath)
@@ -58,17 +61,19 @@ def check_for_simple_xml_searchTemplate_element(app, reporter):
     Use the `<search>` element instead.
     """
 
-    xml_files = list(app.get_filepaths_of_files(basedir="default",
-                                                types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(basedir="default",
+                                           types=[".xml"])
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        searchTemplate = soup.find_all("searchTemplate")
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        searchTemplate = scan[xml_scan.SEARCH_TEMPLATE_ELEMENTS]
         if searchTemplate:
             reporter_output = ("<searchTemplate> detected in"
                                " file: {}").format(relative_filepath)
@@ -88,17 +93,19 @@ def check_for_simple_xml_option_element_with_name_previewResults(app, reporter):
     files.
     """
 
-    xml_files = list(app.get_filepaths_of_files(basedir="default",
-                                                types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(basedir="default",
+                                           types=[".xml"])
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        option_elements = soup.find_all("option", {"name": "previewResults"})
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        option_elements = scan[xml_scan.PREVIEW_RESULTS_OPTION_ELEMENTS]
         if option_elements:
             reporter_output = ("<option name='previewResults'> detected in"
                                " file: {}").format(relative_filepath)
@@ -116,37 +123,27 @@ def check_for_simple_xml_chart_element_with_deprecated_option_names(app, reporte
     `charting.axisLabelsY.majorTickSize` or
     `charting.axisLabelsY.majorLabelVisibility`.
     """
-    attributes = ["charting.axisLabelsY.majorLabelVisibility",
-                  "charting.axisLabelsY.majorTickSize"]
-    attribute_regex_string = "|".join(attributes)
-    attribute_regex = re.compile(attribute_regex_string)
-    xml_files = list(app.get_filepaths_of_files(basedir="default",
-                                                types=[".xml"]))
-    attributes_logging_string = ", ".join(attributes)
+    xml_files = app.get_filepaths_of_files(basedir="default",
+                                           types=[".xml"])
 
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        # Get all chart elements
-        chart_elements = list(soup.find_all("chart"))
-        for chart_element in chart_elements:
-            # Gets all child option elements of said charts, and filters out to
-            # only the ones that have a name attribute with the deprecated
-            # values
-            option_elements = chart_element.find_all("option",
-                                                     {"name": attribute_regex})
-            if option_elements:
-                reporter_output = ("A <chart> was detected with deprecated "
-                                   "options in "
-                                   "file: {}").format(relative_filepath)
-                reporter.fail(reporter_output, relative_filepath)
-            else:
-                pass  # Do nothing, everything is fine
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        # Gets all chart elements that have child option elements with a
+        # name attribute with the deprecated values
+        chart_elements = scan[xml_scan.CHART_ELEMENTS_WITH_DEPRECATED_OPTIONS]
+        for chart_line_number, option_names in chart_elements:
+            reporter_output = ("A <chart> was detected with deprecated "
+                               "options in "
+                               "file: {}").format(relative_filepath)
+            reporter.fail(reporter_output, relative_filepath)
 
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_3", "deprecated_feature", "advanced_xml")
@@ -160,20 +157,22 @@ def check_for_advanced_xml_module_elements(app, reporter):
     # default/data/ui/views.
 
     direcory_to_search = "default/data/ui/views"
-    xml_files = list(app.get_filepaths_of_files(basedir=direcory_to_search,
-                                                types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(basedir=direcory_to_search,
+                                           types=[".xml"])
 
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
         # Get all module elements
-        module_elements = list(soup.find_all("module"))
-        for module_element in module_elements:
+        module_elements = scan[xml_scan.MODULE_ELEMENTS]
+        for module_line_number in module_elements:
             reporter_output = ("<module> element found in"
                                " file: {}").format(relative_filepath)
             reporter.fail(reporter_output, relative_filepath)
@@ -233,63 +232,42 @@ def check_for_advanced_xml_view_element(app, reporter):
     #   - A redirect (not a view at all) if the type attribute is redirect (ie. <view type="redirect">)
     #   - Otherwise it's Advanced XML
 
-    # Tried to make a sweet negative look ahead regex, but it wasn't working
-    # Now you get a boring regex
-    attributes = ["html", "redirect"]
-    attribute_regex_string = "|".join(attributes)
-    attribute_regex = re.compile(attribute_regex_string)
-
     # excludes default/data/ui/nav - #WARNING excludes any nav folder...
     excluded_directories = ["nav"]
 
     # Gets ALL xml files
-    xml_files = list(app.get_filepaths_of_files(excluded_dirs=excluded_directories,
-                                                types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(excluded_dirs=excluded_directories,
+                                           types=[".xml"])
 
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        all_view_elements = list(soup.find_all("view"))
-        non_advanced_xml_view_elements = list(soup.find_all("view", {"type": attribute_regex}))
-        advanced_xml_elements = list(set(all_view_elements) - set(non_advanced_xml_view_elements))
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        advanced_xml_elements = scan[xml_scan.ADVANCED_XML_VIEW_ELEMENTS]
 
         # Currently there is no alternatives for developers using
         # setup and advanced xml.  As such any files located in
         # default/data/ui/manager that use advanced xml are ignored.
-        ignore_segments = ["default", "data", "ui", "manager"]
-        path = os.path.normpath(relative_filepath)
-        segs = path.split(os.sep)
-        if all((s in segs for s in ignore_segments)):
+        if relative_filepath.startswith(ADVANCED_XML_IGNORED_DIRECTORY):
             reporter_output = ("An XML file was detected that contains Advanced"
                                " XML <view> types.  This file has been ignored."
                                " File: {}").format(relative_filepath)
             reporter.not_applicable(reporter_output)
             continue
 
-        if len(advanced_xml_elements) == 0:
-            pass  # Do nothing, everything is fine
-
-        elif len(advanced_xml_elements) >= 1:
-            # Beautiful soup does not provide line numbers for match lxml/html
-            # rather trimmed content elements
-            # Read the file and find the view element line numbers.
-            with open(full_filepath, 'r') as xml_file:
-                content = xml_file.readlines()
-                lines = [x for x in range(len(content)) if "<view" in content[x].strip()]
-
-                for l in lines:
-                    line_number = l + 1
-
-                    reporter_output = ("An XML file that contains Advanced"
-                                       " XML <view> types. was detected."
-                                       " File: {}"
-                                       " Line: {}").format(relative_filepath, line_number)
-                    reporter.fail(reporter_output, relative_filepath, line_number)
+        # The scan records the line number of each advanced xml <view>
+        for line_number in advanced_xml_elements:
+            reporter_output = ("An XML file that contains Advanced"
+                               " XML <view> types. was detected."
+                               " File: {}"
+                               " Line: {}").format(relative_filepath, line_number)
+            reporter.fail(reporter_output, relative_filepath, line_number)
 
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_3", "deprecated_feature", "django_bindings")
@@ -10,13 +10,22 @@ The following features should not be supported in Splunk 6.4 or later. For more,
 import logging
 import re
 import os
-# Third-Party Libraries
-import bs4
 # Custom Libraries
 import splunk_appinspect
+from splunk_appinspect import xml_scan
 
 logger = logging.getLogger(__name__)
 
+# The deprecated d3chart imports are searched for together, so the .js files
+# of an app are only searched once for both of them. The imports share their
+# prefix, so a single pattern finds either in one pass over each line, the
+# group tells them apart
+D3CHART_IMPORT_REGEX = re.compile(r"splunkjs/mvc/d3chart/(d3chartview|googlemapsview)")
+D3CHART_IMPORT_PREFILTER_REGEX = re.compile("splunkjs/mvc/d3chart/")
+
+# Matches the numbers that float() accepts, other than inf and nan
+NUMBER_REGEX = re.compile(r"\A\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*\Z")
+
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_4", "deprecated_feature")
 @splunk_appinspect.cert_version(min="1.1.11")
@@ -25,41 +34,35 @@ def check_for_simple_xml_single_element_with_deprecated_option_names(app, report
     'additionalClass', 'afterLabel', 'beforeLabel', 'classField', 'linkFields',
     'linkSearch', 'linkView'
     """
-    attributes = ["additionalClass", "afterLabel", "beforeLabel", "classField",
-                  "linkFields", "linkSearch", "linkView"]
-    attribute_regex_string = "|".join(attributes)
-    attribute_regex = re.compile(attribute_regex_string)
-    xml_files = list(app.get_filepaths_of_files(basedir="default",
-                                                types=[".xml"]))
-    attributes_logging_string = ", ".join(attributes)
+    xml_files = app.get_filepaths_of_files(basedir="default",
+                                           types=[".xml"])
 
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        # Get all single elements
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        # Gets all single elements that have child option elements with a
+        # name attribute with the deprecated values
         total_single_elements_with_options_found = 0
+        # The names are reported in the order they were found, the set is
+        # only used to test for duplicates
         attributes_found = []
-        single_elements = list(soup.find_all("single"))
-
-        for single_element in single_elements:
-            # Gets all child option elements of said single, and filters out to
-            # only the ones that have a name attribute with the deprecated
-            # values
-            option_elements = single_element.find_all("option",
-                                                      {"name": attribute_regex})
-            if option_elements:
-                total_single_elements_with_options_found += 1
-                for option_element in option_elements:
-                    option_name = option_element.attrs["name"]
-                    if option_name not in attributes_found:
-                        attributes_found.append(option_name)
-        if(total_single_elements_with_options_found > 0 or
-                attributes_found):
+        attributes_found_set = set()
+        single_elements = scan[xml_scan.SINGLE_ELEMENTS_WITH_DEPRECATED_OPTIONS]
+
+        for single_line_number, option_names in single_elements:
+            total_single_elements_with_options_found += 1
+            for option_name in option_names:
+                if option_name not in attributes_found_set:
+                    attributes_found_set.add(option_name)
+                    attributes_found.append(option_name)
+        if total_single_elements_with_options_found > 0:
             attributes_found_string = ", ".join(attributes_found)
             reporter_output = ("{} <single> panel(s) contain the"
                                " option(s): {}"
@@ -67,8 +70,6 @@ def check_for_simple_xml_single_element_with_deprecated_option_names(app, report
                                                    attributes_found_string,
                                                    relative_filepath)
             reporter.fail(reporter_output, relative_filepath)
-        else:
-            pass  # Do nothing, everything is fine
 
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_4", "deprecated_feature", "web_conf")
@@ -77,23 +78,21 @@ def check_web_conf_for_simple_xml_module_render(app, reporter):
     """Check that `web.conf` does not use the simple_xml_module_render
     property.
     """
-    try:
-        web_config = app.web_conf()
-        web_config_file_path = os.path.join("default", "web.conf")
-        for section in web_config.sections():
-            for property, value, lineno in [(p, v, lineno)
-                                    for p, v, lineno in section.items()
-                                    if p == "simple_xml_module_render"]:
-                reporter_output = ("File: {}, "
-                                   "Stanza: {}, "
-                                   "Line: {}."
-                                   ).format(web_config_file_path,
-                                            section.name,
-                                            lineno)
-                reporter.fail(reporter_output, web_config_file_path, lineno)
-    except:
+    if not app.file_exists("default", "web.conf"):
         reporter_output = ("No web.conf file found.")
         reporter.not_applicable(reporter_output)
+        return
+
+    web_config = app.web_conf()
+    web_config_file_path = os.path.join("default", "web.conf")
+    for section, value, lineno in web_config.items_with_name("simple_xml_module_render"):
+        reporter_output = ("File: {}, "
+                           "Stanza: {}, "
+                           "Line: {}."
+                           ).format(web_config_file_path,
+                                    section.name,
+                                    lineno)
+        reporter.fail(reporter_output, web_config_file_path, lineno)
 
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_4", "deprecated_feature", "web_conf")
@@ -102,25 +101,22 @@ def check_web_conf_for_simple_xml_force_flash_charting(app, reporter):
     """Check that a `web.conf` does not use the property
     'simple_xml_force_flash_charting'.
     """
-    try:
-        web_config = app.web_conf()
-        web_config_file_path = os.path.join("default", "web.conf")
-
-        for section in web_config.sections():
-            all_secitions_with_flash_charting = [(p, v, lineno)
-                                                 for p, v, lineno in section.items()
-                                                 if p == "simple_xml_force_flash_charting"]
-            for property, value, lineno in all_secitions_with_flash_charting:
-                reporter_output = ("File: {}, "
-                                   "Stanza: {}, "
-                                   "Line: {}"
-                                   ).format(web_config_file_path,
-                                            section.name,
-                                            lineno)
-                reporter.fail(reporter_output, web_config_file_path, lineno)
-    except:
+    if not app.file_exists("default", "web.conf"):
         reporter_output = ("No web.conf file found.")
         reporter.not_applicable(reporter_output)
+        return
+
+    web_config = app.web_conf()
+    web_config_file_path = os.path.join("default", "web.conf")
+
+    for section, value, lineno in web_config.items_with_name("simple_xml_force_flash_charting"):
+        reporter_output = ("File: {}, "
+                           "Stanza: {}, "
+                           "Line: {}"
+                           ).format(web_config_file_path,
+                                    section.name,
+                                    lineno)
+        reporter.fail(reporter_output, web_config_file_path, lineno)
 
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_4", "deprecated_feature")
@@ -129,29 +125,22 @@ def check_for_noninteger_height_option(app, reporter):
     """Check that `<option name="height">` uses an integer for the value. Do not
     use `<option name="height">[value]px</option>.`
     """
-    # Helper function for determining if string is a number
-    def is_number(string):
-        try:
-            float(string)
-            return True
-        except ValueError:
-            return False
-
-    xml_files = list(app.get_filepaths_of_files(basedir="default",
-                                                types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(basedir="default",
+                                           types=[".xml"])
 
     #  Outputs not_applicable if no xml files found
     if not xml_files:
         reporter_output = "No xml files found."
         reporter.not_applicable(reporter_output)
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        option_elements = soup.find_all("option", {"name": "height"})
-        for option_element in option_elements:
-            option_content = option_element.string
-            if not is_number(option_content):
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        option_elements = scan[xml_scan.HEIGHT_OPTION_ELEMENTS]
+        for option_line_number, option_content in option_elements:
+            if option_content is None or not NUMBER_REGEX.match(option_content):
                 reporter_output = ("File: {}").format(relative_filepath)
                 reporter.fail(reporter_output, relative_filepath)
             else:
@@ -171,42 +160,36 @@ def check_for_splunk_web_legacy_mode(app, reporter):
     # recommended given the performance and configuration benefits
 
     # appServerPorts is a comma separated list of ports
-    try:
-        web_config = app.web_conf()
-        web_config_file_path = os.path.join("default", "web.conf")
-
-        property_being_checked = "appServerPorts"
-        for section in web_config.sections():
-            all_sections_with_app_server_ports = [(p, v, lineno)
-                                                   for p, v, lineno in section.items()
-                                                   if p == property_being_checked]
-
-            for property, value, lineno in all_sections_with_app_server_ports:
-                if(property == property_being_checked and
-                        "0" in value.split(",")):
-                    reporter_output = ("File: {}, "
-                                       "Stanza: [{}], "
-                                       "Line: {}."
-                                       ).format(web_config_file_path,
-                                                section.name,
-                                                lineno)
-                    reporter.fail(reporter_output, web_config_file_path, lineno)
-    except:
+    if not app.file_exists("default", "web.conf"):
         reporter_output = ("No web.conf file found.")
         reporter.not_applicable(reporter_output)
+        return
+
+    web_config = app.web_conf()
+    web_config_file_path = os.path.join("default", "web.conf")
+
+    property_being_checked = "appServerPorts"
+    for section, value, lineno in web_config.items_with_name(property_being_checked):
+        if "0" in value.split(","):
+            reporter_output = ("File: {}, "
+                               "Stanza: [{}], "
+                               "Line: {}."
+                               ).format(web_config_file_path,
+                                        section.name,
+                                        lineno)
+            reporter.fail(reporter_output, web_config_file_path, lineno)
 
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_4", "deprecated_feature")
 @splunk_appinspect.cert_version(min="1.1.11")
 def check_for_splunk_js_d3chartview(app, reporter):
     """Checks that views are not importing d3chartview."""
-    library_import_pattern = "splunkjs/mvc/d3chart/d3chartview"
     relevant_file_types = [".js"]
 
     # This is a little lazy, but search for pattern doesn't return a list of
     # the files being searched, so in order to know the count I get the list of
     # iterated files and then completely ignore it if > 0
-    files = list(app.get_filepaths_of_files(types=relevant_file_types))
+    files = app.get_filepaths_of_files(types=relevant_file_types)
 
     if not files:
         reporter_output = ("No {} files exist."
@@ -214,12 +197,11 @@ def check_for_splunk_js_d3chartview(app, reporter):
         reporter.not_applicable(reporter_output)
 
     # Check starts here
-    matches_found = app.search_for_pattern(library_import_pattern,
-                                           types=relevant_file_types)
+    matches_found = _search_for_d3chart_imports(app)
     for match_file_and_line, match_object in matches_found:
-        match_split = match_file_and_line.rsplit(":", 1)
-        match_file = match_split[0]
-        match_line = match_split[1]
+        if match_object.group(1) != "d3chartview":
+            continue
+        match_file, _, match_line = match_file_and_line.rpartition(":")
         reporter_output = ("File: {}"
                            " Line: {}"
                            ).format(match_file, match_line)
@@ -230,13 +212,12 @@ def check_for_splunk_js_d3chartview(app, reporter):
 @splunk_appinspect.cert_version(min="1.1.11")
 def check_for_splunk_js_googlemapsview(app, reporter):
     """Checks that views are not importing googlemapsview."""
-    library_import_pattern = "splunkjs/mvc/d3chart/googlemapsview"
     relevant_file_types = [".js"]
 
     # This is a little lazy, but search for pattern doesn't return a list of
     # the files being searched, so in order to know the count I get the list of
     # iterated files and then completely ignore it if > 0
-    files = list(app.get_filepaths_of_files(types=relevant_file_types))
+    files = app.get_filepaths_of_files(types=relevant_file_types)
 
     if not files:
         reporter_output = ("No {} files exist."
@@ -244,13 +225,22 @@ def check_for_splunk_js_googlemapsview(app, reporter):
         reporter.not_applicable(reporter_output)
 
     # Check starts here
-    matches_found = app.search_for_pattern(library_import_pattern,
-                                           types=relevant_file_types)
+    matches_found = _search_for_d3chart_imports(app)
     for match_file_and_line, match_object in matches_found:
-        match_split = match_file_and_line.rsplit(":", 1)
-        match_file = match_split[0]
-        match_line = match_split[1]
+        if match_object.group(1) != "googlemapsview":
+            continue
+        match_file, _, match_line = match_file_and_line.rpartition(":")
         reporter_output = ("File: {}"
                            " Line: {}"
                            ).format(match_file, match_line)
         reporter.fail(reporter_output, match_file, match_line)
+
+
+def _search_for_d3chart_imports(app):
+    """Returns the matches of both deprecated d3chart imports in the app's .js
+    files. The result is cached by the App, so only the first of the import
+    checks reads the files.
+    """
+    return app.search_for_pattern(D3CHART_IMPORT_REGEX,
+                                  types=[".js"],
+                                  prefilter=D3CHART_IMPORT_PREFILTER_REGEX)
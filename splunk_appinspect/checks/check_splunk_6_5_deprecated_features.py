@@ -8,23 +8,27 @@ The following features should not be supported in Splunk 6.5 or later. For more,
 
 # Python Standard Libraries
 import logging
-
-# Third-Party Libraries
-import bs4
+import re
 
 # Custom Libraries
 import splunk_appinspect
+from splunk_appinspect import xml_scan
 
 logger = logging.getLogger(__name__)
 
+# Both deprecated views are found by one pattern, in a single pass over each
+# line. Files without the common prefix are not searched at all
+HEADER_FOOTER_VIEW_IMPORT_REGEX = re.compile(r"splunkjs/mvc/(?:header|footer)view")
+HEADER_FOOTER_VIEW_IMPORT_PREFILTER_REGEX = re.compile("splunkjs/mvc/")
+
 
 @splunk_appinspect.tags("splunk_appinspect", "splunk_6_5", "removed_feature")
 @splunk_appinspect.cert_version(min="1.2.1")
 def check_for_simple_xml_list_element(app, reporter):
     """Check Simple XML files for `<list>` element used in dashboards
     """
-    xml_files = list(app.get_filepaths_of_files(basedir="default",
-                                                types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(basedir="default",
+                                           types=[".xml"])
 
     #  Outputs not_applicable if no xml files found
     if not xml_files:
@@ -32,10 +36,12 @@ def check_for_simple_xml_list_element(app, reporter):
         reporter.not_applicable(reporter_output)
         return
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
-        list_elements = list(soup.find_all("list"))
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
+        list_elements = scan[xml_scan.LIST_ELEMENTS]
         count = len(list_elements)
         if count > 0:
             reporter_output = ("{} <list> elements found File: {}".format(count, relative_filepath))
@@ -48,8 +54,8 @@ def check_for_simple_xml_option_element_with_deprecated_attribute_value(app, rep
     """Check Simple XML files for `<option>` element with the deprecated option value "refresh.auto.interval"
      i.e. <option name="refresh.auto.interval">
     """
-    xml_files = list(app.get_filepaths_of_files(basedir="default",
-                                                types=[".xml"]))
+    xml_files = app.get_filepaths_of_files(basedir="default",
+                                           types=[".xml"])
 
     #  Outputs not_applicable if no xml files found
     if not xml_files:
@@ -57,12 +63,13 @@ def check_for_simple_xml_option_element_with_deprecated_attribute_value(app, rep
         reporter.not_applicable(reporter_output)
         return
 
-    # Performs the checks
-    for relative_filepath, full_filepath in xml_files:
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
+    # Performs the checks, on the xml files scanned in parallel
+    xml_scans = app.get_xml_scans([full_filepath
+                                   for relative_filepath, full_filepath
+                                   in xml_files])
+    for (relative_filepath, full_filepath), scan in zip(xml_files, xml_scans):
         total_options_found = 0
-        option_elements = list(soup.find_all("option",
-                                             {"name": "refresh.auto.interval"}))
+        option_elements = scan[xml_scan.REFRESH_AUTO_INTERVAL_OPTION_ELEMENTS]
 
         if option_elements:
             total_options_found += len(option_elements)
@@ -81,13 +88,12 @@ def check_for_splunk_js_header_and_footer_view(app, reporter):
     These are replaced by LayoutView in Splunk 6.5.  LayoutView is not backwards compatible to Splunk 6.4 or earlier.
     Only use LayoutView if you are only targeting Splunk 6.5 or above.
     """
-    library_import_pattern = ["splunkjs/mvc/headerview", "splunkjs/mvc/footerview"]
     relevant_file_types = [".js", ".html"]
 
     # This is a little lazy, but search for pattern doesn't return a list of
     # the files being searched, so in order to know the count I get the list of
     # iterated files and then completely ignore it if < 0
-    files = list(app.get_filepaths_of_files(types=relevant_file_types))
+    files = app.get_filepaths_of_files(types=relevant_file_types)
 
     if not files:
         reporter_output = ("No {} files exist."
@@ -96,12 +102,11 @@ def check_for_splunk_js_header_and_footer_view(app, reporter):
         return
 
     # Check starts here
-    matches_found = app.search_for_patterns(library_import_pattern,
-                                            types=relevant_file_types)
+    matches_found = app.search_for_pattern(HEADER_FOOTER_VIEW_IMPORT_REGEX,
+                                           types=relevant_file_types,
+                                           prefilter=HEADER_FOOTER_VIEW_IMPORT_PREFILTER_REGEX)
     for match_file_and_line, match_object in matches_found:
-        match_split = match_file_and_line.rsplit(":", 1)
-        match_file = match_split[0]
-        match_line = match_split[1]
+        match_file, _, match_line = match_file_and_line.rpartition(":")
         reporter_output = ("As of Splunk 6.5, this functionality is deprecated and should be removed "
                            "in future app versions. Match: {} File: {} Line: {}"
                            ).format(match_object.group(), match_file, match_line)
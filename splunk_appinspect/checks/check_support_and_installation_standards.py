@@ -9,13 +9,17 @@
 # Python Standard Libraries
 import logging
 import os
-import re
 # Custom Libraries
 import splunk_appinspect
 
 report_display_order = 6
 logger = logging.getLogger(__name__)
 
+# Selects the setup <block> and <input> elements whose endpoints configure
+# inputs
+INPUTS_ENDPOINT_XPATH = ("//block[contains(@endpoint, '/inputs/')]"
+                         " | //input[contains(@endpoint, '/inputs/')]")
+
 
 @splunk_appinspect.tags('splunk_appinspect', 'manual', 'appapproval')
 @splunk_appinspect.cert_version(min='1.0.0')
@@ -44,8 +48,7 @@ def check_setup_in_distributed_environment(app, reporter):
         file_path = os.path.join("default", "setup.xml")
         sp = app.setup_xml()
         try:
-            if sp and (sp.parse('xml').find_all('block', endpoint=re.compile('.*/inputs/.*')) \
-                    or sp.parse('xml').find_all('input', endpoint=re.compile('.*/inputs/.*'))):
+            if sp and _configures_inputs(sp):
                 reporter_output = ("Inputs configuration in default/setup.xml "
                                    "are not supported in distributed environments. "
                                    "File: {} "
@@ -74,8 +77,7 @@ def check_setup_in_distributed_environment(app, reporter):
             try:
                 # For html setup view page, we report it as a manual check 
                 sp = app.custom_setup_view_xml(custom_setup_name) if has_xml_file else None
-                if sp and (sp.parse('xml').find_all('block', endpoint=re.compile('.*/inputs/.*')) \
-                        or sp.parse('xml').find_all('input', endpoint=re.compile('.*/inputs/.*'))):
+                if sp and _configures_inputs(sp):
                     reporter_output = ("Inputs configuration in default/data/ui/views/{}.xml are not supported in distributed"
                                        " environments. File: {}"
                                        ).format(custom_setup_name,
@@ -102,3 +104,12 @@ def check_setup_in_distributed_environment(app, reporter):
                                 ).format(custom_setup_name, 
                                          file_path)
             reporter.fail(reporter_output, file_path)
+
+
+def _configures_inputs(setup_file):
+    """Returns True if the setup xml file, a FileResource, has a <block> or
+    <input> element with an inputs endpoint.
+    """
+    setup_tree = setup_file.parse_tree()
+    return (setup_tree.getroot() is not None and
+            len(setup_tree.xpath(INPUTS_ENDPOINT_XPATH)) > 0)
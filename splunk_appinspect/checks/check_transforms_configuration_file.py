@@ -16,6 +16,16 @@ import regex as re
 report_display_order = 2
 logger = logging.getLogger(__name__)
 
+# Lookups shipped as `<name>.default` are referenced by `<name>`
+LOOKUP_DEFAULT_SUFFIX = ".default"
+# The group references of a FORMAT property, e.g. `$1`
+FORMAT_GROUP_REFERENCE_REGEX = re.compile(r"\$(\d+)")
+NON_CAPTURING_GROUP_DOCUMENTATION_URL = ("http://docs.splunk.com/Documentation/Splunk/latest/Knowledge/"
+                                         "AboutSplunkregularexpressions#Non-capturing_group_matching")
+# Number of compiled REGEX values kept by _compile_regex
+COMPILED_REGEX_CACHE_SIZE = 2048
+_compiled_regexes = {}
+
 
 @splunk_appinspect.tags("splunk_appinspect")
 @splunk_appinspect.cert_version(min="1.1.12")
@@ -23,15 +33,7 @@ def check_all_lookups_are_used(app, reporter):
     """Check that all files in the /lookups directory are referenced in
     `transforms.conf`.
     """
-    lookup_file_names = set()
     transforms_reference_file_names = set()
-    for dir, file, ext in app.iterate_files(basedir="lookups"):
-        if file.endswith(".default"):
-            loookup_file_no_default_suffix = file[:len(file) - len(".default")]
-            lookup_file_names.add(loookup_file_no_default_suffix)
-        else:
-            lookup_file_names.add(file)
-
     if app.file_exists("default", "transforms.conf"):
         file_path = os.path.join("default", "transforms.conf")
         transforms = app.transforms_conf()
@@ -39,7 +41,18 @@ def check_all_lookups_are_used(app, reporter):
             if section.has_option("filename"):
                 lookup_file_name = section.get_option("filename").value
                 transforms_reference_file_names.add(lookup_file_name)
-        for filename in (lookup_file_names - transforms_reference_file_names):
+
+        # The lookups are reported as they are found, each name only once as
+        # e.g. `<name>` and `<name>.default` are the same lookup
+        reported_file_names = set()
+        for dir, file, ext in app.iterate_files(basedir="lookups"):
+            filename = (file[:-len(LOOKUP_DEFAULT_SUFFIX)]
+                        if file.endswith(LOOKUP_DEFAULT_SUFFIX)
+                        else file)
+            if(filename in transforms_reference_file_names or
+                    filename in reported_file_names):
+                continue
+            reported_file_names.add(filename)
             reporter_output = ("Lookup file {} is not referenced in"
                                " transforms.conf. File: {}"
                                ).format(filename,
@@ -66,7 +79,7 @@ def check_capture_groups_in_transforms(app, reporter):
                 try:
                     # Splunk regular expressions are PCRE (Perl Compatible Regular Expressions)
                     # re does not support PCRE, so use regex as re, see import part
-                    pattern = re.compile(regex.value)
+                    pattern = _compile_regex(regex.value)
                 except re.error:
                     reporter_output = ("The following stanza contains invalid `REGEX` property."
                                        " Stanza: [{}]"
@@ -79,14 +92,21 @@ def check_capture_groups_in_transforms(app, reporter):
                                                 regex.lineno)
                     reporter.fail(reporter_output, file_path, regex.lineno)
                     return
-                unused_groups = []
+                if pattern.groups == 0:
+                    continue
 
-                for i in range(pattern.groups):
-                    if fmt.value.find("$" + str(i + 1)) < 0:
-                        unused_groups.append("$" + str(i + 1))
+                # A group counts as used if `$<group>` is found anywhere in
+                # FORMAT, which is also the case for every prefix of a longer
+                # reference, e.g. `$1` of `$12`
+                referenced_groups = set()
+                for group_reference in FORMAT_GROUP_REFERENCE_REGEX.findall(fmt.value):
+                    for end in range(1, len(group_reference) + 1):
+                        referenced_groups.add(group_reference[:end])
+                unused_groups = ["$" + str(i)
+                                 for i in range(1, pattern.groups + 1)
+                                 if str(i) not in referenced_groups]
 
                 if len(unused_groups) > 0:
-                    url = "http://docs.splunk.com/Documentation/Splunk/latest/Knowledge/AboutSplunkregularexpressions#Non-capturing_group_matching"
                     reporter_output = ("The following stanza contains `FORMAT`"
                                        " property that does not match its `REGEX` property, missing: {}."
                                        " Stanza: [{}]"
@@ -99,9 +119,24 @@ def check_capture_groups_in_transforms(app, reporter):
                                                 section.name,
                                                 regex,
                                                 fmt.value,
-                                                url,
+                                                NON_CAPTURING_GROUP_DOCUMENTATION_URL,
                                                 file_path,
                                                 section.lineno)
                     reporter.fail(reporter_output, file_path, section.lineno)
     else:
         reporter.not_applicable("No transforms.conf in app.")
+
+
+def _compile_regex(pattern):
+    """Returns the compiled pattern, which is shared by every app that is
+    inspected by this process, as the same REGEX values recur across apps.
+    Patterns that fail to compile raise regex.error and are not cached. Like
+    the cache of the re module, the cache is emptied once it is full.
+    """
+    compiled_regex = _compiled_regexes.get(pattern)
+    if compiled_regex is None:
+        compiled_regex = re.compile(pattern)
+        if len(_compiled_regexes) >= COMPILED_REGEX_CACHE_SIZE:
+            _compiled_regexes.clear()
+        _compiled_regexes[pattern] = compiled_regex
+    return compiled_regex
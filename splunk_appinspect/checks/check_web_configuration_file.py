@@ -18,9 +18,15 @@ and methods= properties.
 import fnmatch
 import logging
 import os
+import re
 # Custom Libraries
 import splunk_appinspect
 
+# The only properties permitted in [expose:*] stanzas
+ALLOWED_EXPOSE_OPTIONS = frozenset(["pattern", "methods"])
+# The characters that make an fnmatch pattern match more than itself
+GLOB_CHARACTERS_REGEX = re.compile(r"[*?[]")
+
 
 @splunk_appinspect.tags("splunk_appinspect", "cloud")
 @splunk_appinspect.cert_version(min="1.5.0")
@@ -33,19 +39,36 @@ def check_web_conf(app, reporter):
         for directory, filename in config_file_paths.iteritems():
             file_path = os.path.join(directory, filename)
             web_conf = app.web_conf(directory)
-            restmap_matches = None
+            # As needed, gather the file names in appserver/controllers
+            controller_file_names = None
             for section in web_conf.sections():
-                if section.name.startswith("endpoint:"):
+                # The stanza type and name are split apart in one pass
+                stanza_type, separator, stanza_name = section.name.partition(":")
+                if separator and stanza_type == "endpoint":
                     # [endpoint:*] stanzas are allowed, should be checked manually
                     # Note that these are part of the Module System which has been
                     # deprecated since Splunk 6.3, as of now these are still
                     # permitted for cloud but should have a corresponding script
                     # in appserver/controllers/<ENDPOINT_NAME>.py
-                    endpoint_name = section.name.split("endpoint:")[1] or "<NOT_FOUND>"
+                    endpoint_name = stanza_name or "<NOT_FOUND>"
+                    script_file_name = "{}.py".format(endpoint_name)
                     script_path = os.path.join("appserver", "controllers",
-                                               "{}.py".format(endpoint_name))
+                                               script_file_name)
+                    if controller_file_names is None:
+                        # Taken from the cached walk of the app only once,
+                        # instead of a stat per endpoint
+                        controller_file_names = set()
+                        for base, directories, files in app.walk(os.path.join("appserver", "controllers")):
+                            controller_file_names.update(files)
+                            break
+
+                    if "/" in script_file_name or os.path.sep in script_file_name:
+                        # Not a file directly in appserver/controllers
+                        script_exists = app.file_exists(script_path)
+                    else:
+                        script_exists = script_file_name in controller_file_names
 
-                    if app.file_exists(script_path):
+                    if script_exists:
                         # The python script check is covered by other checks
                         pass
                     else:
@@ -59,21 +82,21 @@ def check_web_conf(app, reporter):
                                                     file_path,
                                                     section.lineno)
                         reporter.warn(reporter_output, file_path, section.lineno)
-                elif section.name.startswith("expose:"):
+                elif separator and stanza_type == "expose":
                     # [expose:*] stanzas are allowed
                     # Fail all properties besides `pattern` and `methods`
-                    for key, value in section.options.iteritems():
-                        if key != "pattern" and key != "methods":
-                            reporter_output = ("Only the `pattern` and `methods`"
-                                               " properties are permitted for"
-                                               " [expose:*] stanzas. Please remove"
-                                               " this property: `{}`. Stanza: [{}]."
-                                               " File: {}, Line: {}."
-                                               ).format(key,
-                                                        section.name,
-                                                        file_path,
-                                                        value.lineno)
-                            reporter.fail(reporter_output, file_path, value.lineno)
+                    for key in section.options.viewkeys() - ALLOWED_EXPOSE_OPTIONS:
+                        lineno = section.options[key].lineno
+                        reporter_output = ("Only the `pattern` and `methods`"
+                                           " properties are permitted for"
+                                           " [expose:*] stanzas. Please remove"
+                                           " this property: `{}`. Stanza: [{}]."
+                                           " File: {}, Line: {}."
+                                           ).format(key,
+                                                    section.name,
+                                                    file_path,
+                                                    lineno)
+                        reporter.fail(reporter_output, file_path, lineno)
                 else:
                     # stanzas other than [endpoint:*] and [expose:*] are forbidden
                     reporter_output = ("Only the [endpoint:*] and [expose:*]"
@@ -134,19 +157,30 @@ def check_web_conf_expose_patterns_have_restmap_matches(app, reporter):
                         # that matches this expose pattern including * (wildcards)
                         if restmap_patterns is None:
                             # Gather all patterns from restmap.conf only once
-                            restmap_patterns = []
+                            restmap_patterns = frozenset()
                             if app.file_exists(directory, "restmap.conf"):
                                 unformatted_restmap_patterns = app.get_rest_map(dir=directory).all_restmap_patterns()
-                                restmap_patterns = [_format_url_pattern(pattern)
-                                                    for pattern in unformatted_restmap_patterns]
+                                # Case normalized once, as fnmatch would do
+                                # for every expose pattern
+                                restmap_patterns = frozenset(os.path.normcase(_format_url_pattern(pattern))
+                                                             for pattern in unformatted_restmap_patterns)
 
                         # Use fnmatch to find any pattern matches while respecting
                         # asterisk wildcards (e.g. "1/*/other" will match "1/4/other")
                         # Note: this is overly permissive, we are allowing a match of
                         # "a/b/*/f" with "a/b/c/d/e/f" when "*" should only match a
                         # single path element according to the docs
-                        matching_restmaps = fnmatch.filter(restmap_patterns, pattern_to_compare)
-                        if len(matching_restmaps) > 0:
+                        # The expose pattern is the glob. Without wildcards it
+                        # only matches itself, otherwise it is translated once
+                        # and the search stops at the first restmap match
+                        expose_pattern = os.path.normcase(pattern_to_compare)
+                        if GLOB_CHARACTERS_REGEX.search(expose_pattern) is None:
+                            has_restmap_match = expose_pattern in restmap_patterns
+                        else:
+                            expose_regex = re.compile(fnmatch.translate(expose_pattern))
+                            has_restmap_match = any(expose_regex.match(restmap_pattern)
+                                                    for restmap_pattern in restmap_patterns)
+                        if has_restmap_match:
                             # This web.conf endpoint's pattern matches at least one
                             # restmap.conf stanza match= property, check passes
                             pass
@@ -17,6 +17,11 @@ logger = logging.getLogger(__name__)
 
 report_display_order = 20
 
+# Internal links (to the local server) are permitted to be HTTP, external
+# links must use HTTPS. str.startswith tests all of these in one call
+INTERNAL_OR_HTTPS_LINK_URI_PREFIXES = ("/", "http://localhost", "http://127.0.0.1",
+                                       "localhost", "127.0.0.1", "https://")
+
 
 @splunk_appinspect.tags('splunk_appinspect', 'custom_workflow_actions')
 @splunk_appinspect.cert_version(min='1.1.7')
@@ -78,12 +83,7 @@ def check_workflow_actions_link_uri_does_not_use_http_protocol(app, reporter):
         for workflow_action in workflow_actions_with_link_uri:
             links = workflow_action.args["link.uri"]
             link_uri = links[0].strip()
-            # Internal links (to the local server) are permitted to be HTTP,
-            # external links must use HTTPS
-            if (link_uri.startswith("/") or link_uri.startswith("http://localhost") or
-                link_uri.startswith("http://127.0.0.1") or
-                link_uri.startswith("localhost") or link_uri.startswith("127.0.0.1") or
-                link_uri.startswith("https://")):
+            if link_uri.startswith(INTERNAL_OR_HTTPS_LINK_URI_PREFIXES):
                 pass
             else:
                 reporter_output = ("The workflow action [{}] link.uri"
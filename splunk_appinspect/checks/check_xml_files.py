@@ -44,7 +44,9 @@ def check_validate_no_embedded_javascript(app, reporter):
     with Splunk Cloud security policy.
     """
     for relative_filepath, full_filepath in app.get_filepaths_of_files(types=[".xml"]):
-        soup = bs4.BeautifulSoup(open(full_filepath), "html.parser")
+        with open(full_filepath, "rb") as xml_file:
+            content = xml_file.read()
+        soup = bs4.BeautifulSoup(content, "html.parser")
         script_elements = soup.find_all("script")
 
         cdata_script_elements = [e for e in soup(text=True)
@@ -96,7 +98,7 @@ def check_validate_no_event_handler(app, reporter):
         return False
 
     for relative_filepath, full_filepath in app.get_filepaths_of_files(types=[".xml"]):
-        soup = bs4.BeautifulSoup(open(full_filepath), "lxml-xml")
+        soup = app.get_xml_soup(full_filepath)
         elements = soup.find_all(has_global_event_handler_attribute)
         if elements:
             elements_as_strings = ["{}".format(element)
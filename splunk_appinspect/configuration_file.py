@@ -44,7 +44,7 @@ class ConfigurationSection(object):
         setting_key_regex_object = re.compile(setting_key_regex_pattern,
                                               re.IGNORECASE)
         for key, value in self.options.iteritems():
-            if re.search(setting_key_regex_object, key):
+            if setting_key_regex_object.search(key):
                 return True
         return False
 
@@ -57,14 +57,14 @@ class ConfigurationSection(object):
             raise NoOptionError(error_output)
 
     def settings(self):
-        for key, value in self.options.iteritems():
-            yield self.options[key]
+        for value in self.options.itervalues():
+            yield value
 
     def settings_with_key_pattern(self, setting_key_regex_pattern):
         setting_key_regex_object = re.compile(setting_key_regex_pattern,
                                               re.IGNORECASE)
         for key, value in self.options.iteritems():
-            if re.search(setting_key_regex_object, key):
+            if setting_key_regex_object.search(key):
                 yield value
 
     def items(self):
@@ -79,6 +79,7 @@ class ConfigurationFile(object):
         self.headers = []
         self.sects = dict()
         self.errors = []
+        self._settings_by_name = None
 
     def set_main_headers(self, header):
         self.headers = header
@@ -136,6 +137,21 @@ class ConfigurationFile(object):
     def items(self, sectionname):
         return self.get_section(sectionname).items()
 
+    def items_with_name(self, property_name):
+        """Returns a list of (section, value, lineno) tuples for every setting
+        named property_name, in any section. The settings are indexed by name
+        the first time this is called, so it should only be used once the file
+        has been parsed."""
+        if self._settings_by_name is None:
+            settings_by_name = {}
+            for section in self.sects.itervalues():
+                for name, setting in section.options.iteritems():
+                    settings_by_name.setdefault(name, []).append((section,
+                                                                  setting.value,
+                                                                  setting.lineno))
+            self._settings_by_name = settings_by_name
+        return self._settings_by_name.get(property_name, [])
+
     def build_lookup(self):
         """Build a dictionary from a config file where { sect => [options ...] }."""
         return {sect: [option for option in self.sects[sect].options] for sect in self.sects}
@@ -9,6 +9,14 @@ import chardet
 # Custom Libraries
 # N/A
 
+# These are evaluated for every line of every .conf file, so they are compiled
+# once here instead of going through the `re` module cache on each call
+CONTINUATION_REGEX = re.compile("\\\\\\s*$")
+COMMENT_REGEX = re.compile("^\\s*[#;]")
+SPECIFICATION_COMMENT_REGEX = re.compile("^\\s*[#;*]")
+STANZA_REGEX = re.compile("^\\s*\\[")
+
+
 class InvalidSectionError(Exception):
     """ Exception raised when a invalid section is found. """
 
@@ -28,7 +36,7 @@ def join_lines(iterator):
 
     for line in (line.rstrip("\r\n") for line in iterator):
         lineno += 1
-        if re.search("\\\\\\s*$", line):
+        if CONTINUATION_REGEX.search(line):
             if line != line.rstrip():
                 error = "Continuation with trailing whitespace"
             newline = line[:-1] + "\n"
@@ -44,9 +52,9 @@ def configuration_lexer(iterator):
         for item, lineno, error in join_lines(iterator):
             if item == '' or item.isspace():
                 yield ('WHITESPACE', '', lineno, error)
-            elif re.match("^\\s*[#;]", item):
+            elif COMMENT_REGEX.match(item):
                 yield ('COMMENT', item.lstrip(), lineno, error)
-            elif re.match("^\\s*\\[", item):
+            elif STANZA_REGEX.match(item):
                 start = item.index('[')
                 end = item.rindex(']', start)
                 yield ('STANZA', item[start + 1:end], lineno, error)
@@ -66,9 +74,9 @@ def specification_lexer(iterator):
     for item, lineno, error in join_lines(iterator):
         if item == '' or item.isspace():
             yield ('WHITESPACE', '', lineno, error)
-        elif re.match("^\\s*[#;*]", item):
+        elif SPECIFICATION_COMMENT_REGEX.match(item):
             yield ('COMMENT', item.lstrip(), lineno, error)
-        elif re.match("^\\s*\\[", item):
+        elif STANZA_REGEX.match(item):
             start = item.index('[')
             end = item.index(']', start)
             yield ('STANZA', item[start + 1:end], lineno, error)
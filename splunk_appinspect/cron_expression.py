@@ -8,14 +8,23 @@ class CronExpression(object):
         self.fields = self.expression.split()
         if len(self.fields) != 5:
             self._is_valid = False
+        self._occurrences_in_an_hour = None
 
     def is_valid(self):
         return self._is_valid
 
+    def get_occurrences_in_an_hour(self):
+        """Returns a list of 60 booleans, one per minute of an hour, that are
+        True when the expression fires at that minute. The minutes field is
+        only expanded once per expression.
+        """
+        if self._occurrences_in_an_hour is None:
+            self._occurrences_in_an_hour = CronExpression._get_occurrences_in_an_hour(self.fields[0])
+        return self._occurrences_in_an_hour
+
     def is_high_occurring(self):
         try:
-            minutes_field = self.fields[0]
-            occurrences = CronExpression._get_occurrences_in_an_hour(minutes_field)
+            occurrences = self.get_occurrences_in_an_hour()
             # anything more frequent than "every 5 minutes" is considered as high occurring
             return occurrences.count(True) > (60 / 5)
         except:
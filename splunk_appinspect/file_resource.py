@@ -4,6 +4,7 @@
 import os
 import bs4
 import logging
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,10 @@ class FileResource(object):
     def parse(self, fmt):
         try:
             if fmt in ['xml', 'lxml-xml', 'lxml']:
-                return bs4.BeautifulSoup(open(self.file_path), "lxml")
+                # The file is read in one call and closed before parsing
+                with open(self.file_path, 'rb') as parsed_file:
+                    content = parsed_file.read()
+                return bs4.BeautifulSoup(content, "lxml")
         except Exception, e:
             logging.error(str(e))
             raise
@@ -31,3 +35,12 @@ class FileResource(object):
             logging.error("{} file is not supported!".format(fmt))
             raise Exception("{} file is not supported!".format(fmt))
 
+    def parse_tree(self):
+        """Returns the lxml element tree of the file, parsed with the same
+        lenient html parser that parse('lxml') uses under BeautifulSoup. It
+        can be searched with XPath, without the Python objects BeautifulSoup
+        creates for every element. The root of the tree is None if the file
+        has no elements.
+        """
+        return etree.parse(self.file_path, etree.HTMLParser())
+
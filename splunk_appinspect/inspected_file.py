@@ -1,6 +1,7 @@
 # Copyright 2018 Splunk Inc. All rights reserved.
 
 # Standard Python Libraries
+import mmap
 import os
 import re
 # Third-Party Libraries
@@ -9,6 +10,27 @@ import re
 # N/A
 
 
+def file_matches(path, pattern):
+    """
+    :param path: file path
+    :param pattern: regex pattern, as a string or compiled
+    :return: True if the pattern is found anywhere in the file
+
+    The file is searched through a read-only memory map, so files
+    without a match are never read into a string.
+    """
+    with open(path, 'rb') as inspected_file:
+        try:
+            content = mmap.mmap(inspected_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can not be mapped
+            return re.search(pattern, '') is not None
+        try:
+            return re.search(pattern, content) is not None
+        finally:
+            content.close()
+
+
 class InspectedFile(object):
 
     def __init__(self, path=""):
@@ -65,15 +87,27 @@ class InspectedFile(object):
         # In general text file, no need to remove comments
         return content
 
-    def search_for_patterns(self, patterns, excluded_comments=True, regex_option=0):
+    def search_for_patterns(self, patterns, excluded_comments=True, regex_option=0, prefilter=None):
         """
         :param patterns: regex patterns array
         :param excluded_comments: excluded comment from test
         :param regex_option: regex option
+        :param prefilter: optional regex that must be found on a line for any
+            of the patterns to be able to match on it, e.g. an alternation of
+            the literals the patterns require. Files without it are skipped
+            before comment removal, and lines without it are not matched
+            against the patterns.
         :return: array of match objects
         """
 
         matches = []
+        # Compile once per file rather than once per line
+        regex_objects = [re.compile(p, regex_option) for p in patterns]
+
+        if prefilter is not None:
+            if not file_matches(self._path, prefilter):
+                return matches
+            prefilter = re.compile(prefilter)
 
         with open(self._path) as inspected_file:
             line_no = 0
@@ -82,16 +116,18 @@ class InspectedFile(object):
                 content = self._remove_comments(content)
             for line in content.splitlines():
                 line_no += 1
-                for rx in [re.compile(p, regex_option) for p in patterns]:
+                if prefilter is not None and not prefilter.search(line):
+                    continue
+                for rx in regex_objects:
                     for p_match in rx.finditer(line):
                         fileref_output = "{}:{}".format(self._path, line_no)
                         matches.append((fileref_output, p_match))
 
         return matches
 
-    def search_for_pattern(self, pattern, excluded_comments=True, regex_option=0):
+    def search_for_pattern(self, pattern, excluded_comments=True, regex_option=0, prefilter=None):
         """ Same with search_for_patterns except single pattern."""
-        return self.search_for_patterns([pattern], excluded_comments, regex_option)
+        return self.search_for_patterns([pattern], excluded_comments, regex_option, prefilter)
 
     def search_for_crossline_patterns(self, patterns, excluded_comments=True, cross_line=10):
         """
@@ -101,6 +137,7 @@ class InspectedFile(object):
         """
 
         matches = []
+        regex_objects = [re.compile(p) for p in patterns]
 
         with open(self._path) as inspected_file:
             line_no = 0
@@ -111,17 +148,24 @@ class InspectedFile(object):
             lines_content = content.splitlines()
             lines_count = len(lines_content)
 
+            # The lines are joined once, and the offset of each line start is
+            # recorded, so every window of `cross_line` lines is one slice
+            # instead of being concatenated line by line
+            joined_content = ''.join(item + '\n' for item in lines_content)
+            line_offsets = [0]
+            for item in lines_content:
+                line_offsets.append(line_offsets[-1] + len(item) + 1)
+
             for line_no in range(0,lines_count):
-                multi_line = ''
                 start_line = line_no
                 end_line = (start_line+cross_line) if (start_line+cross_line) <= lines_count  else lines_count
-                for item in lines_content[start_line:end_line]:
-                    multi_line += item + '\n'
+                multi_line = joined_content[line_offsets[start_line]:line_offsets[end_line]]
 
-                for rx in [re.compile(p) for p in patterns]:
-                    if rx.match(multi_line):
+                for rx in regex_objects:
+                    p_match = rx.match(multi_line)
+                    if p_match:
                         fileref_output = "{}:{}".format(self._path, line_no+1)
-                        matches.append((fileref_output, rx.match(multi_line))) 
+                        matches.append((fileref_output, p_match))
 
         return matches
 
@@ -85,7 +85,8 @@ class InputTextValueUsedInJavascript(ReflectedXSSDetectRule):
         input_ids = set()
         for directory, f, ext in app.iterate_files(types=['.html']):
             current_file_full_path = app.get_filename(directory, f)
-            soup = BeautifulSoup(open(current_file_full_path, 'r').read(), 'html.parser')
+            with open(current_file_full_path, 'rb') as current_file:
+                soup = BeautifulSoup(current_file.read(), 'html.parser')
             input_list = soup.find_all("input", {'type': 'text'})
             for input in input_list:
                 if input.get('id') is not None:
@@ -135,7 +136,8 @@ class SimpleXMLVariableUsedInElementSource(ReflectedXSSDetectRule):
         for directory, f, ext in app.iterate_files(types=['.xml']):
             current_file_full_path = app.get_filename(directory, f)
             # collect tokens in this file
-            soup = BeautifulSoup(open(current_file_full_path, 'r').read(), 'lxml')
+            with open(current_file_full_path, 'rb') as current_file:
+                soup = BeautifulSoup(current_file.read(), 'lxml')
             tokens = set()
             for element in soup.findAll("input", {"type": "text"}):
                 if element.get('token') is not None:
@@ -200,7 +202,8 @@ class UserHTMLReflectedXSSDetectRule(ReflectedXSSDetectRule):
         for directory, f, ext in app.iterate_files(types=['.html']):
             current_file_full_path = app.get_filename(directory, f)
             current_file_path = os.path.join(directory, f)
-            soup = BeautifulSoup(open(current_file_full_path, 'r').read(), 'html.parser')
+            with open(current_file_full_path, 'rb') as current_file:
+                soup = BeautifulSoup(current_file.read(), 'html.parser')
             ans.extend(self.check_file(app, current_file_path, soup))
         return ans
 
@@ -58,7 +58,7 @@ class RegexMatcher(object):
                                                       regex_option=regex_option)
 
         for fileref_output, file_match in matches:
-            lineno = fileref_output.rsplit(":", 1)[1]
+            lineno = fileref_output.rpartition(":")[2]
             ans.append((int(lineno), self._get_match_result(file_match)))
 
         ans.sort()
@@ -35,6 +35,8 @@ LINE_PATTERN = r'(L|l)ine\s*\w*:\s*\d*'
 for idx, status in enumerate(STATUS_TYPES):
     STATUS_PRIORITIES[status] = idx
 
+PRINTABLE_CHARACTERS = frozenset(string.printable)
+
 def _reduce_record_summary(acc, x):
     acc[x.result] = acc.get(x.result, 0) + 1
     return acc
@@ -52,6 +54,14 @@ def _extract_values(pattern, message):
             v2 = v2.strip()
     return v1, v2
 
+def _outer_frame_info(frame, frameoffset):
+    """Returns the frame info of the frame `frameoffset` levels above `frame`,
+    like inspect.getouterframes(frame)[frameoffset] without the frame object,
+    but reads the source context of that one frame only."""
+    for _ in range(frameoffset):
+        frame = frame.f_back
+    return inspect.getframeinfo(frame)
+
 def extract_filename_lineno(message):
     filename = _extract_values(FILE_PATTERN, message)[1]
     lineno = _extract_values(LINE_PATTERN, message)[1]
@@ -95,7 +105,7 @@ class Reporter(object):
 
             # Used to respect to __save_result_message conventions
             current_frame = inspect.currentframe()
-            _, file, line, _, code, _ = inspect.getouterframes(current_frame)[1]
+            file, line, _, code, _ = _outer_frame_info(current_frame, 1)
             filepath, filename = os.path.split(file)
             records.append(ReportRecord("warning",
                                         "Suppressed " + text,
@@ -110,11 +120,11 @@ class Reporter(object):
 
     def __save_result_message(self, result, message, frame, file_name=None, line_number=None, frameoffset=1):
         # What is this black magic below????
-        _, file, line, _, code, _ = inspect.getouterframes(frame)[frameoffset]
+        file, line, _, code, _ = _outer_frame_info(frame, frameoffset)
         (filepath, filename) = os.path.split(file)
         message_stripped_of_unprintables = ''.join(s
                                                    for s in message
-                                                   if s in string.printable)
+                                                   if s in PRINTABLE_CHARACTERS)
         report_record = ReportRecord(result,
                                      message_stripped_of_unprintables,
                                      filename,
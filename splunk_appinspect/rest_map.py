@@ -60,14 +60,19 @@ class RestMap(object):
         self.directory = directory
         self.restmap_conf_file_path = self.app.get_filename(directory,
                                                             'restmap.conf')
+        self._configuration_file = None
 
     def configuration_file_exists(self):
         return self.app.file_exists(self.directory, 'restmap.conf')
 
     def get_configuration_file(self):
-        return self.app.get_config('restmap.conf',
-                                   dir=self.directory,
-                                   config_file=rest_map_configuration_file.RestMapConfigurationFile())
+        # Parsed once, the handlers and patterns below look it up for every
+        # section. A missing file raises IOError every time, it is not cached
+        if self._configuration_file is None:
+            self._configuration_file = self.app.get_config('restmap.conf',
+                                                           dir=self.directory,
+                                                           config_file=rest_map_configuration_file.RestMapConfigurationFile())
+        return self._configuration_file
 
     def global_handler_file(self):
         """
@@ -71,40 +71,52 @@ class SavedSearches:
         self.app = app
         self.commands_conf_file_path = app.get_filename('default',
                                                         'savedsearches.conf')
+        self._configuration_file = None
+        self._searches = None
 
     def configuration_file_exists(self):
         return self.app.file_exists('default', 'savedsearches.conf')
 
     def get_configuration_file(self):
-        return self.app.get_config('savedsearches.conf',
-                                   config_file=saved_searches_configuration_file.SavedSearchesConfigurationFile())
+        # The parsed file is kept so that every check sharing this object
+        # only pays for parsing savedsearches.conf once
+        if self._configuration_file is None:
+            self._configuration_file = self.app.get_config('savedsearches.conf',
+                                                           config_file=saved_searches_configuration_file.SavedSearchesConfigurationFile())
+        return self._configuration_file
 
     def searches(self):
+        if self._searches is not None:
+            return self._searches
 
         search_list = []
 
-        for section in self.get_configuration_file().sections():
+        # Parse the file once for all sections instead of once per section
+        configuration_file = self.get_configuration_file()
+        for section in configuration_file.sections():
 
             search = SavedSearch(section)
 
-            for key, value, lineno in self.get_configuration_file().items(section.name):
-                search.args[key.lower()] = (value, lineno)
+            for key, value, lineno in section.items():
+                key = key.lower()
+                search.args[key] = (value, lineno)
 
-                if key.lower() == "cron_schedule":
+                if key == "cron_schedule":
                     search.cron_schedule = value
 
-                if key.lower() == "disabled":
+                elif key == "disabled":
                     search.disabled = value
 
-                if key.lower() == "dispatch.earliest_time":
+                elif key == "dispatch.earliest_time":
                     search.dispatch_earliest_time = value
 
-                if key.lower() == "dispatch.latest_time":
+                elif key == "dispatch.latest_time":
                     search.dispatch_latest_time = value
 
-                if key.lower() == "search":
+                elif key == "search":
                     search.searchcmd = value
 
             search_list.append(search)
 
+        self._searches = search_list
         return search_list
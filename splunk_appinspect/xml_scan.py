@@ -0,0 +1,219 @@
+# Copyright 2018 Splunk Inc. All rights reserved.
+
+"""Collects the Simple and Advanced XML elements inspected by the
+deprecated feature checks in a single pass over an xml file, streamed with
+lxml. The scan of a file is shared by all of those checks, which look up the
+elements of their rule instead of searching the file again.
+"""
+
+# Python Standard Libraries
+import re
+import threading
+# Third-Party Libraries
+from lxml import etree
+# Custom Libraries
+from splunk_appinspect import inspected_file
+
+# Names of the rules, which are the keys of the dict returned by scan_xml
+SEED_ELEMENTS = "seed_elements"
+SEARCH_TEMPLATE_ELEMENTS = "search_template_elements"
+PREVIEW_RESULTS_OPTION_ELEMENTS = "preview_results_option_elements"
+HEIGHT_OPTION_ELEMENTS = "height_option_elements"
+CHART_ELEMENTS_WITH_DEPRECATED_OPTIONS = "chart_elements_with_deprecated_options"
+SINGLE_ELEMENTS_WITH_DEPRECATED_OPTIONS = "single_elements_with_deprecated_options"
+ADVANCED_XML_VIEW_ELEMENTS = "advanced_xml_view_elements"
+MODULE_ELEMENTS = "module_elements"
+LIST_ELEMENTS = "list_elements"
+REFRESH_AUTO_INTERVAL_OPTION_ELEMENTS = "refresh_auto_interval_option_elements"
+
+DEPRECATED_CHART_OPTIONS = frozenset(["charting.axisLabelsY.majorLabelVisibility",
+                                      "charting.axisLabelsY.majorTickSize"])
+DEPRECATED_SINGLE_OPTIONS = frozenset(["additionalClass", "afterLabel",
+                                       "beforeLabel", "classField",
+                                       "linkFields", "linkSearch", "linkView"])
+# A <view> of any other type, or without one, is advanced xml
+NON_ADVANCED_XML_VIEW_TYPES = frozenset(["html", "redirect"])
+
+# Panels that are inspected for deprecated options
+PANEL_TAG_NAMES = frozenset(["chart", "single"])
+# Every rule matches one of these tags, which may have a namespace prefix.
+# <chart> and <single> panels only matter when they contain an <option>.
+# UTF-8 files without any of them are not parsed
+SCANNED_TAGS_PREFILTER_REGEX = re.compile(r"<(?:[\w.-]+:)?(?:seed|searchTemplate|option|view|module|list)\b")
+# The start of a file that is read to tell whether its tags are ASCII bytes
+PROLOG_SIZE = 1024
+
+# An lxml parser keeps a single parsing context, which is locked for the
+# duration of a parse. A parser shared by the threads that run the checks
+# would parse one document at a time, so each thread creates its own
+_parsers = threading.local()
+
+# The encoding declared by an xml prolog, which may follow a UTF-8 byte order
+# mark. Files encoded as UTF-16 or UTF-32 do not match
+XML_DECLARED_ENCODING_REGEX = re.compile(r"\A(?:\xef\xbb\xbf)?<\?xml[^>]*?\sencoding\s*=\s*[\"']([A-Za-z0-9._-]+)")
+XML_DECLARATION_REGEX = re.compile(r"\A(?:\xef\xbb\xbf)?<\?xml\b")
+UTF_16_AND_32_BYTE_ORDER_MARKS = ("\xfe\xff", "\xff\xfe", "\x00\x00\xfe\xff")
+
+
+def xml_parser():
+    """Returns the calling thread's lxml parser for the checks that parse an
+    app's xml files into a tree. Entities are not resolved and nothing is
+    fetched from the network, so the files of an app can not pull in other
+    files or urls.
+    """
+    parser = getattr(_parsers, "xml_parser", None)
+    if parser is None:
+        parser = etree.XMLParser(resolve_entities=False,
+                                 no_network=True,
+                                 huge_tree=False)
+        _parsers.xml_parser = parser
+    return parser
+
+
+def is_utf_8(content):
+    """Returns True if the bytes of an xml document are known to be UTF-8,
+    either because its prolog declares it or because it has neither an
+    encoding declaration nor a UTF-16 or UTF-32 byte order mark, which makes
+    UTF-8 the default. Parsers given such a document can skip guessing its
+    character set.
+
+    :param content The bytes of the xml document
+    """
+    if content.startswith(UTF_16_AND_32_BYTE_ORDER_MARKS):
+        return False
+    declared_encoding = XML_DECLARED_ENCODING_REGEX.match(content)
+    if declared_encoding is not None:
+        return declared_encoding.group(1).lower() in ("utf-8", "utf8")
+    if XML_DECLARATION_REGEX.match(content) is None:
+        return True
+    # A declaration without an encoding also defaults to UTF-8, one with an
+    # encoding that was not matched above is left to the parser
+    prolog_end = content.find("?>")
+    return prolog_end != -1 and "encoding" not in content[:prolog_end]
+
+
+def scan_xml(full_filepath):
+    """Streams an xml file with lxml and returns a dict, keyed by the rule
+    names above, that describes the elements each rule matched in document
+    order.
+
+    The values of CHART_ELEMENTS_WITH_DEPRECATED_OPTIONS and
+    SINGLE_ELEMENTS_WITH_DEPRECATED_OPTIONS are lists of (line number,
+    deprecated option names) tuples, the value of HEIGHT_OPTION_ELEMENTS is a
+    list of (line number, text) tuples and the other values are lists of line
+    numbers.
+
+    Each element is cleared once it has been inspected, so memory use is
+    bounded by the depth of the document rather than its size. Like the
+    `lxml-xml` parser of BeautifulSoup, the parser recovers from malformed
+    xml instead of failing.
+
+    :param full_filepath The absolute path of the xml file
+    """
+    results = {SEED_ELEMENTS: [],
+               SEARCH_TEMPLATE_ELEMENTS: [],
+               PREVIEW_RESULTS_OPTION_ELEMENTS: [],
+               HEIGHT_OPTION_ELEMENTS: [],
+               CHART_ELEMENTS_WITH_DEPRECATED_OPTIONS: [],
+               SINGLE_ELEMENTS_WITH_DEPRECATED_OPTIONS: [],
+               ADVANCED_XML_VIEW_ELEMENTS: [],
+               MODULE_ELEMENTS: [],
+               LIST_ELEMENTS: [],
+               REFRESH_AUTO_INTERVAL_OPTION_ELEMENTS: []}
+    # Panels are recorded in document order when they start, their
+    # deprecated options are appended as the options end. The elements of
+    # the open panels are kept, so that their ids stay unique
+    panels = []
+    open_panels = {}
+
+    if(_has_ascii_tags(full_filepath) and
+            not inspected_file.file_matches(full_filepath, SCANNED_TAGS_PREFILTER_REGEX)):
+        return results
+
+    try:
+        for event, element in etree.iterparse(full_filepath,
+                                              events=("start", "end"),
+                                              recover=True,
+                                              huge_tree=False,
+                                              resolve_entities=False,
+                                              no_network=True):
+            tag = _local_name(element.tag)
+            if event == "start":
+                if tag in PANEL_TAG_NAMES:
+                    deprecated_option_names = []
+                    panels.append((tag, element.sourceline, deprecated_option_names))
+                    open_panels[id(element)] = (element, deprecated_option_names)
+                continue
+
+            if tag == "seed":
+                results[SEED_ELEMENTS].append(element.sourceline)
+            elif tag == "searchTemplate":
+                results[SEARCH_TEMPLATE_ELEMENTS].append(element.sourceline)
+            elif tag in PANEL_TAG_NAMES:
+                del open_panels[id(element)]
+            elif tag == "view":
+                if element.get("type") not in NON_ADVANCED_XML_VIEW_TYPES:
+                    results[ADVANCED_XML_VIEW_ELEMENTS].append(element.sourceline)
+            elif tag == "module":
+                results[MODULE_ELEMENTS].append(element.sourceline)
+            elif tag == "list":
+                results[LIST_ELEMENTS].append(element.sourceline)
+            elif tag == "option":
+                _scan_option(element, results, open_panels)
+
+            # Nothing is looked up in an element, or in the elements before
+            # it, once it has ended. The root element has no parent, the
+            # comments and processing instructions before it are kept
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+    except etree.XMLSyntaxError:
+        # Raised for empty files, or malformed xml that can not be
+        # recovered from. The elements found until then are reported
+        pass
+
+    for panel_tag, line_number, deprecated_option_names in panels:
+        if not deprecated_option_names:
+            continue
+        if panel_tag == "chart":
+            results[CHART_ELEMENTS_WITH_DEPRECATED_OPTIONS].append((line_number, deprecated_option_names))
+        else:
+            results[SINGLE_ELEMENTS_WITH_DEPRECATED_OPTIONS].append((line_number, deprecated_option_names))
+    return results
+
+
+def _scan_option(element, results, open_panels):
+    option_name = element.get("name")
+    if option_name is None:
+        return
+    if option_name == "previewResults":
+        results[PREVIEW_RESULTS_OPTION_ELEMENTS].append(element.sourceline)
+    elif option_name == "height":
+        results[HEIGHT_OPTION_ELEMENTS].append((element.sourceline, element.text))
+    elif option_name == "refresh.auto.interval":
+        results[REFRESH_AUTO_INTERVAL_OPTION_ELEMENTS].append(element.sourceline)
+    is_deprecated_chart_option = option_name in DEPRECATED_CHART_OPTIONS
+    is_deprecated_single_option = option_name in DEPRECATED_SINGLE_OPTIONS
+    if is_deprecated_chart_option or is_deprecated_single_option:
+        for parent in element.iterancestors():
+            parent_tag = _local_name(parent.tag)
+            if((parent_tag == "chart" and is_deprecated_chart_option) or
+                    (parent_tag == "single" and is_deprecated_single_option)):
+                open_panels[id(parent)][1].append(option_name)
+
+
+def _local_name(tag):
+    # Like BeautifulSoup, elements are matched by their name without a
+    # namespace, which lxml puts in braces, or an unbound prefix
+    return tag.rpartition("}")[2].rpartition(":")[2]
+
+
+def _has_ascii_tags(full_filepath):
+    # The tag names of a UTF-8 document are ASCII bytes that the prefilter
+    # can find, the tags of a UTF-16 or UTF-32 document, with or without a
+    # byte order mark, are not. Other declared encodings are parsed as well
+    with open(full_filepath, "rb") as xml_file:
+        prolog = xml_file.read(PROLOG_SIZE)
+    return "\x00" not in prolog[:4] and is_utf_8(prolog)
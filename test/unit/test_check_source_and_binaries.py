@@ -0,0 +1,90 @@
+# Copyright 2018 Splunk Inc. All rights reserved.
+
+"""Unit tests for the patterns of the source and binaries checks."""
+
+# Python Standard Libraries
+import ast
+import imp
+import os
+import re
+import subprocess
+import sys
+import time
+# Third-Party Libraries
+import pytest
+# Custom Libraries
+import splunk_appinspect
+
+# The check modules are not a package, they are loaded the same way the
+# checks are grouped
+check_source_and_binaries = imp.load_source(
+    "check_source_and_binaries",
+    os.path.join(splunk_appinspect.checks.DEFAULT_CHECKS_DIR, "check_source_and_binaries.py"))
+
+# URL_REGEX before the protocol had to start at a word boundary. It finds the
+# same urls, but backtracks quadratically on long words
+PREVIOUS_URL_REGEX = re.compile("(\w*://)+"
+                                "([\w\d\-]+\.[\w\d\-\.]+)"
+                                "(:\d*)?"
+                                "(\/[^\s\?]*)?"
+                                "(\?[^\s]*)?",
+                                re.IGNORECASE)
+
+# re holds the GIL while it searches, so a search that does not finish can
+# only be stopped in another process. The previous pattern takes minutes on a
+# word this long, the current one a fraction of a second
+LONG_WORD = "a" * 200000
+SEARCH_TIMEOUT_SECONDS = 60
+SEARCH_SCRIPT = ("import re, sys\n"
+                 "match = re.compile(sys.argv[1], int(sys.argv[2])).search(sys.stdin.read())\n"
+                 "sys.stdout.write(repr(match.span() if match else None))\n")
+
+
+def _search_in_child_process(line):
+    """Returns the span of the URL_REGEX match in line, or None, searched in
+    a child process that fails the test if it does not finish in time.
+    """
+    child = subprocess.Popen([sys.executable, "-c", SEARCH_SCRIPT,
+                              check_source_and_binaries.URL_REGEX.pattern,
+                              str(check_source_and_binaries.URL_REGEX.flags)],
+                             stdin=subprocess.PIPE,
+                             stdout=subprocess.PIPE)
+    child.stdin.write(line)
+    child.stdin.close()
+    deadline = time.time() + SEARCH_TIMEOUT_SECONDS
+    while child.poll() is None:
+        if time.time() > deadline:
+            child.kill()
+            child.wait()
+            pytest.fail("URL_REGEX did not finish searching a {} character line"
+                        " in {} seconds".format(len(line), SEARCH_TIMEOUT_SECONDS))
+        time.sleep(0.05)
+    return ast.literal_eval(child.stdout.read())
+
+
+def _span(regex, line):
+    match = regex.search(line)
+    return match.span() if match else None
+
+
+def test_url_regex_matches_url():
+    match = check_source_and_binaries.URL_REGEX.search("see https://dev.splunk.com:8000/path/page?q=1 for more")
+    assert match.group() == "https://dev.splunk.com:8000/path/page?q=1"
+
+
+@pytest.mark.parametrize("line", ["a" * 40 + "!",
+                                  "a" * 40 + "!http://example.com",
+                                  "a" * 40 + "://example.com",
+                                  "x=ftp://a.b:80/c?d e"])
+def test_url_regex_matches_previous_pattern(line):
+    assert (_span(check_source_and_binaries.URL_REGEX, line) ==
+            _span(PREVIOUS_URL_REGEX, line))
+
+
+def test_url_regex_on_long_single_word_line():
+    assert _search_in_child_process(LONG_WORD) is None
+
+
+def test_url_regex_on_long_single_word_line_with_url():
+    line = LONG_WORD + "!http://example.com"
+    assert _search_in_child_process(line) == (len(LONG_WORD) + 1, len(line))
@@ -0,0 +1,90 @@
+# Copyright 2018 Splunk Inc. All rights reserved.
+
+"""Unit tests for the shared Simple XML scan."""
+
+# Python Standard Libraries
+# N/A
+# Third-Party Libraries
+# N/A
+# Custom Libraries
+from splunk_appinspect import xml_scan
+
+
+def _scan(tmpdir, content):
+    xml_file = tmpdir.join("dashboard.xml")
+    xml_file.write(content, mode="wb")
+    return xml_scan.scan_xml(str(xml_file))
+
+
+def test_scan_xml_with_comment_before_root(tmpdir):
+    results = _scan(tmpdir, ("<!-- Copyright -->\n"
+                             "<dashboard>\n"
+                             "  <module name=\"x\"/>\n"
+                             "</dashboard>\n"))
+    assert results[xml_scan.MODULE_ELEMENTS] == [3]
+
+
+def test_scan_xml_with_processing_instruction_before_root(tmpdir):
+    results = _scan(tmpdir, ("<?xml version=\"1.0\"?>\n"
+                             "<?xml-stylesheet href=\"style.xsl\"?>\n"
+                             "<dashboard>\n"
+                             "  <seed/>\n"
+                             "  <module name=\"x\"/>\n"
+                             "</dashboard>\n"))
+    assert results[xml_scan.SEED_ELEMENTS] == [4]
+    assert results[xml_scan.MODULE_ELEMENTS] == [5]
+
+
+def test_scan_xml_of_utf_16_document(tmpdir):
+    content = (u"<?xml version=\"1.0\" encoding=\"UTF-16\"?>\n"
+               u"<dashboard>\n"
+               u"  <module name=\"x\"/>\n"
+               u"</dashboard>\n")
+    results = _scan(tmpdir, content.encode("utf-16"))
+    assert results[xml_scan.MODULE_ELEMENTS] == [3]
+
+
+def test_scan_xml_of_utf_16_document_without_byte_order_mark(tmpdir):
+    content = (u"<?xml version=\"1.0\" encoding=\"UTF-16LE\"?>\n"
+               u"<dashboard>\n"
+               u"  <list/>\n"
+               u"</dashboard>\n")
+    results = _scan(tmpdir, content.encode("utf-16-le"))
+    assert results[xml_scan.LIST_ELEMENTS] == [3]
+
+
+def test_scan_xml_with_namespace_prefixed_tags(tmpdir):
+    results = _scan(tmpdir, ("<dashboard xmlns:s=\"urn:splunk\">\n"
+                             "  <s:seed/>\n"
+                             "  <s:single>\n"
+                             "    <s:option name=\"linkView\">search</s:option>\n"
+                             "  </s:single>\n"
+                             "</dashboard>\n"))
+    assert results[xml_scan.SEED_ELEMENTS] == [2]
+    assert results[xml_scan.SINGLE_ELEMENTS_WITH_DEPRECATED_OPTIONS] == [(3, ["linkView"])]
+
+
+def _record_parses(monkeypatch):
+    parsed_filepaths = []
+    iterparse = xml_scan.etree.iterparse
+
+    def recording_iterparse(source, *args, **kwargs):
+        parsed_filepaths.append(source)
+        return iterparse(source, *args, **kwargs)
+
+    monkeypatch.setattr(xml_scan.etree, "iterparse", recording_iterparse)
+    return parsed_filepaths
+
+
+def test_scan_xml_skips_files_without_scanned_tags(tmpdir, monkeypatch):
+    parsed_filepaths = _record_parses(monkeypatch)
+    results = _scan(tmpdir, "<dashboard><row><panel/></row></dashboard>\n")
+    assert parsed_filepaths == []
+    assert all(not elements for elements in results.values())
+
+
+def test_scan_xml_parses_files_with_scanned_tags(tmpdir, monkeypatch):
+    parsed_filepaths = _record_parses(monkeypatch)
+    results = _scan(tmpdir, "<dashboard><row><panel><seed/></panel></row></dashboard>\n")
+    assert parsed_filepaths == [str(tmpdir.join("dashboard.xml"))]
+    assert results[xml_scan.SEED_ELEMENTS] == [1]